@@ -16,10 +16,28 @@ REDIRECT_URI = os.getenv('STREAMLIT_REDIRECT_URI', 'https://rithra-marketing-46g
 GOOGLE_ADS_DEVELOPER_TOKEN = os.getenv('GOOGLE_ADS_DEVELOPER_TOKEN')
 GOOGLE_ADS_CUSTOMER_ID = os.getenv('GOOGLE_ADS_CUSTOMER_ID')
 
+# Google Ads dönüşümleri geriye dönük güncelleyebilir; bu kadar günlük pencere yerel depoda
+# yeniden senkronize edilir (en fazla GOOGLE_ADS_RESYNC_MINUTES dakikada bir)
+GOOGLE_ADS_RESTATEMENT_DAYS = int(os.getenv('GOOGLE_ADS_RESTATEMENT_DAYS', '14'))
+GOOGLE_ADS_RESYNC_MINUTES = int(os.getenv('GOOGLE_ADS_RESYNC_MINUTES', '60'))
+
+# Google Ads satırlarını proto-plus yerine ham protobuf üzerinden çöz (daha hızlı, isteğe bağlı)
+GOOGLE_ADS_RAW_DECODE = os.getenv('GOOGLE_ADS_RAW_DECODE', 'false').lower() in ('1', 'true', 'yes')
+
 # Meta Ads yapılandırması
 META_APP_ID = os.getenv('META_APP_ID')
 META_APP_SECRET = os.getenv('META_APP_SECRET')
 
+# Yerel önbellek dizini (SQLite dosyaları)
+LOCAL_STORE_DIR = os.getenv('LOCAL_STORE_DIR', '.cache')
+
+# Search Console verisi bu kadar günden eski olduğunda kesinleşmiş sayılır
+SEARCH_CONSOLE_FINALIZATION_DAYS = 3
+
+# Search Console API kotaları (dakika başına sorgu)
+SEARCH_CONSOLE_SITE_QPM = int(os.getenv('SEARCH_CONSOLE_SITE_QPM', '1200'))
+SEARCH_CONSOLE_PROJECT_QPM = int(os.getenv('SEARCH_CONSOLE_PROJECT_QPM', '40000'))
+
 # OAuth 2.0 kapsamları
 SCOPES = [
     'https://www.googleapis.com/auth/webmasters.readonly',  # Google Search Console
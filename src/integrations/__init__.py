@@ -4,18 +4,43 @@ from .google_search_console import (
     get_credentials,
     save_credentials,
     get_search_console_service,
+    get_credentials_cache_key,
     list_sites,
-    get_search_analytics
+    get_search_analytics,
+    iter_search_analytics,
+    get_portfolio_analytics,
+    build_dimension_filter_groups
+)
+
+from .search_console_cache import get_cached_search_analytics, get_cached_period_rows
+from .search_console_frame import (
+    SearchAnalyticsFrameBuilder,
+    build_search_analytics_frame,
+    get_frame_memory_usage,
+    summarize_search_analytics
 )
 
 from .google_ads import (
     get_google_ads_client,
+    release_google_ads_client,
     get_google_ads_total_spend,
     get_google_ads_credentials,
     save_google_ads_credentials,
     get_campaigns_data,
+    get_campaign_report,
+    get_all_customers_campaigns,
     list_customer_accounts,
-    get_conversion_details
+    get_conversion_details,
+    iter_search_stream_batches
+)
+from .google_ads_decode import RowDecoder, get_row_decoder
+from .google_ads_frame import (
+    CampaignDailyBuilder,
+    CampaignDayMatrix,
+    ConversionDetailsBuilder,
+    aggregate_campaigns,
+    micros_to_currency,
+    rolling_mean
 )
 
 from .meta_ads import (
@@ -30,16 +55,38 @@ __all__ = [
     'get_credentials',
     'save_credentials',
     'get_search_console_service',
+    'get_credentials_cache_key',
     'list_sites',
     'get_search_analytics',
+    'iter_search_analytics',
+    'get_portfolio_analytics',
+    'build_dimension_filter_groups',
+    'get_cached_search_analytics',
+    'get_cached_period_rows',
+    'SearchAnalyticsFrameBuilder',
+    'build_search_analytics_frame',
+    'get_frame_memory_usage',
+    'summarize_search_analytics',
     # Google Ads
     'get_google_ads_client',
+    'release_google_ads_client',
     'get_google_ads_total_spend',
     'get_google_ads_credentials',
     'save_google_ads_credentials',
     'get_campaigns_data',
+    'get_campaign_report',
+    'get_all_customers_campaigns',
     'list_customer_accounts',
     'get_conversion_details',
+    'iter_search_stream_batches',
+    'RowDecoder',
+    'get_row_decoder',
+    'CampaignDailyBuilder',
+    'aggregate_campaigns',
+    'micros_to_currency',
+    'CampaignDayMatrix',
+    'ConversionDetailsBuilder',
+    'rolling_mean',
     # Meta Ads
     'get_meta_ads_insights_for_account',
     'get_all_meta_ads_data',
@@ -1,16 +1,38 @@
 """Google Ads entegrasyonu"""
 import streamlit as st
-from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from src.integrations.google_ads_decode import get_row_decoder, to_raw_message
+from src.integrations.google_ads_frame import (
+    CAMPAIGN_DAILY_FIELDS,
+    CONVERSION_DETAIL_FIELDS,
+    CampaignDailyBuilder,
+    ConversionDetailsBuilder,
+    CampaignDayMatrix,
+    aggregate_campaigns
+)
+from src.integrations.google_ads_pool import google_ads_client_pool
+from src.integrations.google_ads_store import get_stored_campaign_days, get_stored_keyword_attributes
 from src.config import (
     GOOGLE_ADS_DEVELOPER_TOKEN,
     GOOGLE_ADS_CUSTOMER_ID,
     GOOGLE_CLIENT_ID,
-    GOOGLE_CLIENT_SECRET
+    GOOGLE_CLIENT_SECRET,
+    GOOGLE_ADS_RAW_DECODE,
+    GOOGLE_ADS_RESYNC_MINUTES
 )
+from src.utils.cache_keys import get_credentials_cache_key
+
+# Bellek önbelleği, depodaki düzeltme penceresinin yeniden senkron aralığından uzun tutulmaz
+REPORT_CACHE_TTL = GOOGLE_ADS_RESYNC_MINUTES * 60
+ACCOUNT_WORKERS = 8
+
+# (credential anahtarı, hesap) -> yenileme sayacı; önbellek anahtarına girer, yenileme
+# sonrası tüm oturumlar aynı yeni sonucu paylaşır
+_report_generations = {}
 
 
 def get_google_ads_credentials():
@@ -34,48 +56,145 @@ def save_google_ads_credentials(credentials):
 
 
 def get_google_ads_client():
-    """Google Ads API client'ı oluştur"""
+    """Google Ads API client'ını havuzdan al
+    
+    Client credential başına bir kez oluşturulur ve rerun'lar arasında yeniden
+    kullanılır; token arka planda yenilenir. Oturumun credential'ı değişirse
+    eski client havuzdan çıkarılır (kanallar kapatılmaz, paylaşan oturumlar etkilenmez).
+    """
     if not GOOGLE_ADS_DEVELOPER_TOKEN or not GOOGLE_ADS_CUSTOMER_ID:
         return None
     
     credentials = get_google_ads_credentials()
-    if not credentials:
+    if not credentials or not credentials.refresh_token:
         return None
     
-    # Token'ı yenile
-    if credentials.expired and credentials.refresh_token:
-        try:
-            credentials.refresh(Request())
-            save_google_ads_credentials(credentials)
-        except Exception as e:
-            st.error(f"Token yenileme hatası: {e}")
-            return None
-    
     try:
-        # Google Ads API client'ı oluştur
-        client = GoogleAdsClient.load_from_dict({
+        key, client = google_ads_client_pool.get({
             "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
             "client_id": GOOGLE_CLIENT_ID,
             "client_secret": GOOGLE_CLIENT_SECRET,
             "refresh_token": credentials.refresh_token,
             "use_proto_plus": True
         })
-        return client
     except Exception as e:
         st.error(f"Google Ads client oluşturma hatası: {e}")
         return None
+    
+    previous_key = st.session_state.get('google_ads_client_key')
+    if previous_key and previous_key != key:
+        google_ads_client_pool.evict(previous_key)
+    st.session_state['google_ads_client_key'] = key
+    return client
 
 
-def get_campaigns_data(client, customer_id, start_date=None, end_date=None):
-    """Kampanya performans verilerini çek"""
+def release_google_ads_client():
+    """Oturumun client'ını havuzdan çıkar (bağlantı kesilince)
+    
+    Bağlantısı kesilen refresh token için arka plan yenileyici token üretmeyi bırakır.
+    Kanallar kapatılmaz; aynı client'ı kullanan oturum akışını tamamlar, sonraki
+    isteğinde havuz yeni client oluşturur.
+    """
+    key = st.session_state.pop('google_ads_client_key', None)
+    if key:
+        google_ads_client_pool.evict(key)
+
+
+def iter_search_stream_batches(client, customer_id, query, raw=False):
+    """GAQL sorgusunu tek search_stream çağrısıyla çalıştır, satırları batch batch döndür
+    
+    search sayfa başına ayrı istek atar; stream sonuçları tek bağlantı üzerinden
+    parça parça gönderir. Bellekte her seferinde yalnızca bir batch tutulur.
+    raw=True ise satırlar proto-plus yerine ham protobuf mesajları olarak döner.
+    """
+    ga_service = client.get_service("GoogleAdsService")
+    stream = ga_service.search_stream(customer_id=customer_id, query=query)
+    for batch in stream:
+        yield to_raw_message(batch).results if raw else batch.results
+
+
+def _search_decoded(client, customer_id, query):
+    """Sorgu sonucunu SELECT sırasındaki değer tuple'ları olarak döndür - yapı önbelleği sorguları için"""
+    decoder = get_row_decoder(query)
+    rows = []
+    for batch in iter_search_stream_batches(client, customer_id, query, raw=True):
+        rows.extend(decoder.decode(batch))
+    return rows
+
+
+def _fetch_campaign_daily(client, customer_id, start_date, end_date, raw_decode=None):
+    """Kampanya x gün satırlarını stream ile tipli sütunlara çek - hatalar çağırana iletilir"""
+    if raw_decode is None:
+        raw_decode = GOOGLE_ADS_RAW_DECODE
+    
+    # Sorgu oluştur - segments.date ile günlük veri çek
+    fields = ',\n            '.join(CAMPAIGN_DAILY_FIELDS)
+    query = f"""
+        SELECT
+            {fields}
+        FROM campaign
+        WHERE campaign.status != 'REMOVED'
+        AND segments.date BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY campaign.id, segments.date
+    """
+    
+    # Tek stream çağrısı - satırlar batch geldikçe tipli sütunlara çözülür
+    builder = CampaignDailyBuilder()
+    if raw_decode:
+        decoder = get_row_decoder(query)
+        for batch in iter_search_stream_batches(client, customer_id, query, raw=True):
+            builder.append_decoded(decoder.decode(batch))
+    else:
+        for batch in iter_search_stream_batches(client, customer_id, query):
+            builder.append_rows(batch)
+    return builder
+
+
+def _load_campaign_days(client, customer_id, start_date, end_date, force_resync=False):
+    """Müşteri deposunu senkronize edip aralığın günlük satırlarını oku - hatalar çağırana iletilir
+    
+    force_resync=True düzeltme penceresindeki günleri yeniden senkron süresini beklemeden çeker.
+    """
+    def fetch_range(range_start, range_end):
+        return _fetch_campaign_daily(client, customer_id, range_start, range_end)
+    
+    def search(query):
+        return _search_decoded(client, customer_id, query)
+    
+    return get_stored_campaign_days(customer_id, fetch_range, search, start_date, end_date, force_resync)
+
+
+@st.cache_data(ttl=REPORT_CACHE_TTL, show_spinner=False, max_entries=64)
+def _fetch_campaign_report(credentials_key, customer_id, start_date, end_date, generation, _client, _force_resync=False):
+    """Kampanya toplamları ve kampanya x gün matrisi - kullanıcı, hesap, aralık ve yenileme sayacı başına önbellekte
+    
+    Günlük satırlar yerel depodan okunur; API'den sadece eksik günler ve düzeltme penceresi çekilir.
+    """
+    daily_df, attributes_df, _ = _load_campaign_days(_client, customer_id, start_date, end_date, _force_resync)
+    
+    # Toplama ve oranlar vektörel hesaplanır (para mikro cinsinden toplanır)
+    campaigns = aggregate_campaigns(daily_df, attributes_df)
+    matrix = CampaignDayMatrix.from_frame(daily_df, attributes_df, start_date, end_date)
+    return campaigns, matrix
+
+
+def get_campaign_report(client, customer_id, start_date=None, end_date=None, refresh=False):
+    """Kampanya performans toplamları ve günlük matris
+    
+    Dönüş: (kampanya DataFrame'i, CampaignDayMatrix) - hata durumunda (None, None).
+    Sonuç önbellekte tutulur; aynı aralık için grafikler tekrar API çağrısı yapmaz.
+    Varsayılan olarak depo ve önbellek kullanılır (düzeltme penceresi en fazla
+    GOOGLE_ADS_RESYNC_MINUTES'ta bir çekilir). refresh=True (Yenile düğmesi) önbelleği
+    atlar ve pencereyi hemen yeniden çeker; sonraki çağrılar yeni sonucu önbellekten alır.
+    """
     if not client or not customer_id:
-        return []
+        return None, None
     
     # Customer ID formatını düzelt (tire varsa kaldır, 10 haneli olmalı)
     customer_id = str(customer_id).replace('-', '')
     if len(customer_id) != 10:
         st.error(f"Geçersiz Customer ID formatı: {customer_id}. 10 haneli olmalı.")
-        return []
+        return None, None
     
     # Varsayılan tarih aralığı: Son 30 gün
     if not end_date:
@@ -83,102 +202,21 @@ def get_campaigns_data(client, customer_id, start_date=None, end_date=None):
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
+    credentials_key = get_credentials_cache_key(client.credentials)
+    generation_key = (credentials_key, customer_id)
+    if refresh:
+        _report_generations[generation_key] = _report_generations.get(generation_key, 0) + 1
+    
     try:
-        ga_service = client.get_service("GoogleAdsService")
-        
-        # Sorgu oluştur - segments.date ile günlük veri çek
-        query = f"""
-            SELECT
-                campaign.id,
-                campaign.name,
-                campaign.status,
-                segments.date,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.cost_micros,
-                metrics.conversions,
-                metrics.ctr,
-                metrics.average_cpc,
-                metrics.cost_per_conversion
-            FROM campaign
-            WHERE campaign.status != 'REMOVED'
-            AND segments.date BETWEEN '{start_date}' AND '{end_date}'
-            ORDER BY campaign.id, segments.date
-        """
-        
-        # İstek gönder
-        response = ga_service.search(customer_id=customer_id, query=query)
-        
-        campaigns_data = []
-        campaign_dict = {}
-        
-        for row in response:
-            campaign_id = row.campaign.id
-            campaign_name = row.campaign.name
-            
-            if campaign_id not in campaign_dict:
-                campaign_dict[campaign_id] = {
-                    'Kampanya ID': campaign_id,
-                    'Kampanya Adı': campaign_name,
-                    'Durum': row.campaign.status.name,
-                    'Gösterim': 0,
-                    'Tıklama': 0,
-                    'Maliyet (₺)': 0.0,
-                    'Dönüşüm': 0.0,
-                    'CTR': 0.0,
-                    'Ortalama CPC (₺)': 0.0,
-                    'Dönüşüm Başına Maliyet (₺)': 0.0,
-                    'Günlük Kayıt Sayısı': 0
-                }
-            
-            # Metrikleri topla
-            if row.metrics.impressions:
-                campaign_dict[campaign_id]['Gösterim'] += row.metrics.impressions
-            if row.metrics.clicks:
-                campaign_dict[campaign_id]['Tıklama'] += row.metrics.clicks
-            if row.metrics.cost_micros:
-                campaign_dict[campaign_id]['Maliyet (₺)'] += row.metrics.cost_micros / 1_000_000
-            if row.metrics.conversions:
-                campaign_dict[campaign_id]['Dönüşüm'] += row.metrics.conversions
-            
-            # Ortalama değerler (son değerleri kullan)
-            if row.metrics.ctr is not None:
-                campaign_dict[campaign_id]['CTR'] = row.metrics.ctr
-            if row.metrics.average_cpc is not None:
-                campaign_dict[campaign_id]['Ortalama CPC (₺)'] = row.metrics.average_cpc / 1_000_000
-            if row.metrics.cost_per_conversion is not None and row.metrics.cost_per_conversion > 0:
-                campaign_dict[campaign_id]['Dönüşüm Başına Maliyet (₺)'] = row.metrics.cost_per_conversion / 1_000_000
-            
-            campaign_dict[campaign_id]['Günlük Kayıt Sayısı'] += 1
-        
-        # CTR'yi hesapla (toplam tıklama / toplam gösterim * 100)
-        for campaign_id in campaign_dict:
-            if campaign_dict[campaign_id]['Gösterim'] > 0:
-                campaign_dict[campaign_id]['CTR'] = (
-                    campaign_dict[campaign_id]['Tıklama'] / 
-                    campaign_dict[campaign_id]['Gösterim'] * 100
-                )
-            # Ortalama CPC'yi hesapla
-            if campaign_dict[campaign_id]['Tıklama'] > 0:
-                campaign_dict[campaign_id]['Ortalama CPC (₺)'] = (
-                    campaign_dict[campaign_id]['Maliyet (₺)'] / 
-                    campaign_dict[campaign_id]['Tıklama']
-                )
-            # Dönüşüm başına maliyeti hesapla
-            if campaign_dict[campaign_id]['Dönüşüm'] > 0:
-                campaign_dict[campaign_id]['Dönüşüm Başına Maliyet (₺)'] = (
-                    campaign_dict[campaign_id]['Maliyet (₺)'] / 
-                    campaign_dict[campaign_id]['Dönüşüm']
-                )
-            
-            # Günlük kayıt sayısını kaldır (gösterim için değil)
-            del campaign_dict[campaign_id]['Günlük Kayıt Sayısı']
-        
-        campaigns_data = list(campaign_dict.values())
-        # Maliyete göre sırala
-        campaigns_data.sort(key=lambda x: x['Maliyet (₺)'], reverse=True)
-        return campaigns_data
-        
+        return _fetch_campaign_report(
+            credentials_key,
+            customer_id,
+            start_date,
+            end_date,
+            _report_generations.get(generation_key, 0),
+            client,
+            _force_resync=refresh
+        )
     except GoogleAdsException as ex:
         error_message = ""
         for error in ex.failure.errors:
@@ -194,12 +232,81 @@ def get_campaigns_data(client, customer_id, start_date=None, end_date=None):
                 for field_path_element in error.location.field_path_elements:
                     error_message += f"  Field: {field_path_element.field_name}\n"
         st.error(f"Google Ads API hatası:\n{error_message}")
-        return []
+        return None, None
     except Exception as e:
         st.error(f"Beklenmeyen hata: {e}")
         import traceback
         st.error(f"Detay: {traceback.format_exc()}")
+        return None, None
+
+
+def get_campaigns_data(client, customer_id, start_date=None, end_date=None):
+    """Kampanya performans verilerini çek"""
+    campaigns, _ = get_campaign_report(client, customer_id, start_date, end_date)
+    if campaigns is None:
         return []
+    return campaigns.to_dict('records')
+
+
+def _format_google_ads_error(ex):
+    """GoogleAdsException içindeki hata mesajlarını tek satırda birleştir"""
+    return "; ".join(error.message for error in ex.failure.errors) or str(ex)
+
+
+def _fetch_customer_campaigns(client, customer_id, start_date, end_date):
+    """Tek hesabın kampanya toplamları - thread içinde çalışır, st kullanmaz, hatalar çağırana iletilir"""
+    daily_df, attributes_df, _ = _load_campaign_days(client, customer_id, start_date, end_date)
+    return aggregate_campaigns(daily_df, attributes_df)
+
+
+def get_all_customers_campaigns(client, customer_accounts, start_date, end_date, max_workers=ACCOUNT_WORKERS):
+    """Tüm müşteri hesaplarının kampanyalarını ortak client ile sınırlı thread havuzunda çek
+    
+    Bir hesabın hatası diğerlerini durdurmaz.
+    Dönüş: (Customer ID / Hesap Adı etiketli birleşik DataFrame, [{'customer_id', 'error'}])
+    """
+    # Varsayılan tarih aralığı: Son 30 gün
+    if not end_date:
+        end_date = datetime.now().date()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    
+    frames = []
+    errors = []
+    accounts = {
+        str(account['Customer ID']).replace('-', ''): account
+        for account in customer_accounts
+    }
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_customer_campaigns, client, customer_id, start_date, end_date): customer_id
+            for customer_id in accounts
+        }
+        for future in as_completed(futures):
+            customer_id = futures[future]
+            try:
+                campaigns = future.result()
+            except GoogleAdsException as ex:
+                errors.append({'customer_id': customer_id, 'error': _format_google_ads_error(ex)})
+                continue
+            except Exception as error:
+                errors.append({'customer_id': customer_id, 'error': str(error)})
+                continue
+            
+            if campaigns.empty:
+                continue
+            account = accounts[customer_id]
+            campaigns.insert(0, 'Customer ID', customer_id)
+            campaigns.insert(1, 'Hesap Adı', account.get('Hesap Adı', customer_id))
+            campaigns.insert(2, 'Para Birimi', account.get('Para Birimi', 'N/A'))
+            frames.append(campaigns)
+    
+    if not frames:
+        return pd.DataFrame(), errors
+    
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.sort_values('Maliyet (₺)', ascending=False, kind='stable', ignore_index=True), errors
 
 
 def list_customer_accounts(client, manager_customer_id=None):
@@ -285,16 +392,22 @@ def list_customer_accounts(client, manager_customer_id=None):
         return []
 
 
-def get_conversion_details(client, customer_id, start_date=None, end_date=None):
-    """Dönüşüm detaylarını çek - önce sadece keyword'den dönüşüm bilgisi"""
+def get_conversion_details(client, customer_id, start_date=None, end_date=None, raw_decode=None):
+    """Dönüşüm detaylarını çek - keyword x eşleşme türü x reklam grubu x tarih
+    
+    Sonuç kümesi sınırsız stream edilir ve geldikçe sütun bazlı toplanır; dönüş
+    kategori sütunlu bir DataFrame'dir (hata/veri yoksa boş).
+    raw_decode=True (varsayılan: GOOGLE_ADS_RAW_DECODE) satırları ham protobuf
+    üzerinden sorgu başına hazırlanmış erişimcilerle çözer.
+    """
     if not client or not customer_id:
-        return []
+        return pd.DataFrame()
     
     # Customer ID formatını düzelt
     customer_id = str(customer_id).replace('-', '')
     if len(customer_id) != 10:
         st.error(f"Geçersiz Customer ID formatı: {customer_id}. 10 haneli olmalı.")
-        return []
+        return pd.DataFrame()
     
     # Varsayılan tarih aralığı: Son 30 gün
     if not end_date:
@@ -303,77 +416,36 @@ def get_conversion_details(client, customer_id, start_date=None, end_date=None):
         start_date = end_date - timedelta(days=30)
     
     try:
-        ga_service = client.get_service("GoogleAdsService")
-        
         # Adım 1: Sadece keyword'den dönüşüm bilgisi - basit sorgu
         # keyword_view için keyword bilgileri ad_group_criterion.keyword üzerinden erişilir
+        # Satır sınırı yok; sıralama yerelde yapılır
+        fields = ',\n                '.join(CONVERSION_DETAIL_FIELDS)
         query = f"""
             SELECT
-                ad_group_criterion.keyword.text,
-                ad_group_criterion.keyword.match_type,
-                ad_group.name,
-                campaign.name,
-                metrics.conversions,
-                metrics.conversions_value,
-                segments.date
+                {fields}
             FROM keyword_view
             WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
             AND metrics.conversions > 0
-            ORDER BY metrics.conversions DESC, segments.date DESC
-            LIMIT 10000
         """
         
-        # İstek gönder
-        response = ga_service.search(customer_id=customer_id, query=query)
+        # Tek stream çağrısı - her batch gelir gelmez çözülüp anahtar bazında toplanır
+        builder = ConversionDetailsBuilder()
+        if raw_decode is None:
+            raw_decode = GOOGLE_ADS_RAW_DECODE
+        if raw_decode:
+            decoder = get_row_decoder(query)
+            for batch in iter_search_stream_batches(client, customer_id, query, raw=True):
+                builder.append_decoded(decoder.decode(batch))
+        else:
+            for batch in iter_search_stream_batches(client, customer_id, query):
+                builder.append_rows(batch)
         
-        conversion_details = []
-        for row in response:
-            try:
-                keyword_text = row.ad_group_criterion.keyword.text if hasattr(row, 'ad_group_criterion') and row.ad_group_criterion and hasattr(row.ad_group_criterion, 'keyword') and row.ad_group_criterion.keyword else 'N/A'
-            except:
-                keyword_text = 'N/A'
-            
-            try:
-                match_type = row.ad_group_criterion.keyword.match_type.name if hasattr(row, 'ad_group_criterion') and row.ad_group_criterion and hasattr(row.ad_group_criterion, 'keyword') and row.ad_group_criterion.keyword and hasattr(row.ad_group_criterion.keyword, 'match_type') else 'N/A'
-            except:
-                match_type = 'N/A'
-            
-            try:
-                ad_group_name = row.ad_group.name if hasattr(row, 'ad_group') and row.ad_group else 'N/A'
-            except:
-                ad_group_name = 'N/A'
-            
-            try:
-                campaign_name = row.campaign.name if hasattr(row, 'campaign') and row.campaign else 'N/A'
-            except:
-                campaign_name = 'N/A'
-            
-            try:
-                conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') and row.metrics.conversions else 0
-            except:
-                conversions = 0
-            
-            try:
-                conversions_value = row.metrics.conversions_value if hasattr(row.metrics, 'conversions_value') and row.metrics.conversions_value else 0.0
-            except:
-                conversions_value = 0.0
-            
-            try:
-                date = str(row.segments.date) if hasattr(row.segments, 'date') else 'N/A'
-            except:
-                date = 'N/A'
-            
-            conversion_details.append({
-                'Tarih': date,
-                'Keyword': keyword_text,
-                'Eşleşme Türü': match_type,
-                'Reklam Grubu': ad_group_name,
-                'Kampanya': campaign_name,
-                'Dönüşüm Sayısı': conversions,
-                'Dönüşüm Değeri (₺)': conversions_value
-            })
+        # Anahtar kelime, reklam grubu ve kampanya adları yapı önbelleğinden eşlenir
+        def search(attribute_query):
+            return _search_decoded(client, customer_id, attribute_query)
         
-        return conversion_details
+        keyword_attributes = get_stored_keyword_attributes(customer_id, search, builder.criterion_keys)
+        return builder.to_frame(keyword_attributes)
         
     except GoogleAdsException as ex:
         error_message = ""
@@ -386,12 +458,12 @@ def get_conversion_details(client, customer_id, start_date=None, end_date=None):
                 pass
             error_message += f"Error {error_code_str}{error.message}\n"
         st.error(f"Dönüşüm detayları çekilirken hata:\n{error_message}")
-        return []
+        return pd.DataFrame()
     except Exception as e:
         st.error(f"Beklenmeyen hata: {e}")
         import traceback
         st.error(f"Detay: {traceback.format_exc()}")
-        return []
+        return pd.DataFrame()
 
 
 def get_google_ads_total_spend():
@@ -0,0 +1,90 @@
+"""Google Ads satırları için ham protobuf hızlı çözümleme
+
+proto-plus her alan erişiminde sarmalayıcı nesne üretir; burada GAQL sorgusundaki
+alanlar için erişimciler bir kez hazırlanır ve satırlar doğrudan ham protobuf
+mesajları üzerinden okunur.
+"""
+import re
+from functools import lru_cache
+from operator import attrgetter
+
+_SELECT_PATTERN = re.compile(r'\bSELECT\b(.*?)\bFROM\b', re.IGNORECASE | re.DOTALL)
+
+
+def parse_gaql_fields(query):
+    """GAQL sorgusunun SELECT listesindeki alan yollarını sırasıyla döndür"""
+    match = _SELECT_PATTERN.search(query)
+    if not match:
+        raise ValueError("GAQL sorgusunda SELECT ... FROM bulunamadı")
+    return [field.strip() for field in match.group(1).split(',') if field.strip()]
+
+
+def to_raw_message(message):
+    """proto-plus mesajının altındaki ham protobuf mesajını kopyalamadan al"""
+    pb = getattr(type(message), 'pb', None)
+    return pb(message) if pb is not None else message
+
+
+def _resolve_field(descriptor, path):
+    """Alan yolunu (ör. ad_group_criterion.keyword.match_type) son alan tanımına çöz"""
+    field = None
+    for name in path.split('.'):
+        field = descriptor.fields_by_name[name]
+        descriptor = field.message_type
+    return field
+
+
+class RowDecoder:
+    """Bir GAQL sorgusu için hazırlanmış alan erişimcileri
+    
+    Tüm alanlar tek bir attrgetter ile okunur; enum alanları sayısal değerden
+    isme önceden hesaplanmış tabloyla çevrilir. Enum tabloları ilk satırın
+    tanımından (API sürümüne göre) bir kez çıkarılır.
+    """
+    
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.getter = attrgetter(*self.fields)
+        self.descriptor = None
+        self.enum_names = ()
+    
+    def _prepare(self, descriptor):
+        enum_names = []
+        for index, path in enumerate(self.fields):
+            field = _resolve_field(descriptor, path)
+            if field.enum_type is not None:
+                names = {value.number: value.name for value in field.enum_type.values}
+                enum_names.append((index, names))
+        self.enum_names = tuple(enum_names)
+        self.descriptor = descriptor
+    
+    def decode(self, rows):
+        """Ham satırları alan sırasıyla değer tuple'larına çevir"""
+        if not len(rows):
+            return []
+        if rows[0].DESCRIPTOR is not self.descriptor:
+            self._prepare(rows[0].DESCRIPTOR)
+        
+        getter = self.getter
+        single = len(self.fields) == 1
+        decoded = []
+        for row in rows:
+            values = getter(row)
+            if single:
+                values = (values,)
+            if self.enum_names:
+                values = list(values)
+                for index, names in self.enum_names:
+                    values[index] = names.get(values[index], 'UNKNOWN')
+            decoded.append(values)
+        return decoded
+
+
+@lru_cache(maxsize=64)
+def _get_fields_decoder(fields):
+    return RowDecoder(fields)
+
+
+def get_row_decoder(query):
+    """Sorgunun alan listesi için bir kez hazırlanan RowDecoder (tarih gibi filtreler anahtara girmez)"""
+    return _get_fields_decoder(tuple(parse_gaql_fields(query)))
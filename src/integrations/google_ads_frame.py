@@ -0,0 +1,310 @@
+"""Google Ads satırlarını sütun bazında DataFrame'e dönüştürme ve toplama"""
+from array import array
+import numpy as np
+import pandas as pd
+from src.utils.columnar import DictionaryColumn
+
+CAMPAIGN_ID_COLUMN = 'Kampanya ID'
+CAMPAIGN_NAME_COLUMN = 'Kampanya Adı'
+STATUS_COLUMN = 'Durum'
+DATE_COLUMN = 'Tarih'
+IMPRESSIONS_COLUMN = 'Gösterim'
+CLICKS_COLUMN = 'Tıklama'
+COST_MICROS_COLUMN = 'Maliyet (mikro)'
+CONVERSIONS_COLUMN = 'Dönüşüm'
+
+MICROS_PER_UNIT = 1_000_000
+
+# Kampanya x gün sorgusunun alanları - append_decoded bu sırayı bekler.
+# Ad/durum yapı önbelleğinden gelir, metrik sorgusunda tekrar çekilmez.
+CAMPAIGN_DAILY_FIELDS = (
+    'campaign.id',
+    'segments.date',
+    'metrics.impressions',
+    'metrics.clicks',
+    'metrics.cost_micros',
+    'metrics.conversions'
+)
+
+# Dönüşüm detayı (keyword_view) sorgusunun alanları -
+# ConversionDetailsBuilder.append_decoded bu sırayı bekler.
+# Anahtar kelime, reklam grubu ve kampanya adları yapı önbelleğinden ID ile eşlenir.
+CONVERSION_DETAIL_FIELDS = (
+    'ad_group.id',
+    'ad_group_criterion.criterion_id',
+    'metrics.conversions',
+    'metrics.conversions_value',
+    'segments.date'
+)
+
+
+class CampaignDailyBuilder:
+    """Kampanya x gün satırlarını tipli sütunlarda biriktir
+    
+    Para birimleri mikro cinsinden int64 tutulur; ₺'ye çevirme yalnızca
+    toplama sonrası gösterim aşamasında yapılır. Kampanya adı/durumu
+    satırlarda yoktur, yapı önbelleğinden eşlenir.
+    """
+    
+    def __init__(self):
+        self.campaign_ids = array('q')
+        self.dates = []
+        self.impressions = array('q')
+        self.clicks = array('q')
+        self.cost_micros = array('q')
+        self.conversions = array('d')
+    
+    def __len__(self):
+        return len(self.campaign_ids)
+    
+    def append_rows(self, rows):
+        """Bir stream batch'indeki satırları sütunlara ekle"""
+        for row in rows:
+            metrics = row.metrics
+            self.campaign_ids.append(row.campaign.id)
+            self.dates.append(row.segments.date)
+            self.impressions.append(metrics.impressions)
+            self.clicks.append(metrics.clicks)
+            self.cost_micros.append(metrics.cost_micros)
+            self.conversions.append(metrics.conversions)
+    
+    def append_decoded(self, rows):
+        """RowDecoder ile çözülmüş (CAMPAIGN_DAILY_FIELDS sırasındaki) değerleri ekle"""
+        for campaign_id, date, impressions, clicks, cost_micros, conversions in rows:
+            self.campaign_ids.append(campaign_id)
+            self.dates.append(date)
+            self.impressions.append(impressions)
+            self.clicks.append(clicks)
+            self.cost_micros.append(cost_micros)
+            self.conversions.append(conversions)
+    
+    def to_frame(self):
+        """Günlük satırlardan tipli DataFrame oluştur"""
+        return pd.DataFrame({
+            CAMPAIGN_ID_COLUMN: np.array(self.campaign_ids, dtype=np.int64),
+            DATE_COLUMN: np.array(self.dates, dtype='datetime64[D]'),
+            IMPRESSIONS_COLUMN: np.array(self.impressions, dtype=np.int64),
+            CLICKS_COLUMN: np.array(self.clicks, dtype=np.int64),
+            COST_MICROS_COLUMN: np.array(self.cost_micros, dtype=np.int64),
+            CONVERSIONS_COLUMN: np.array(self.conversions, dtype=np.float64)
+        })
+
+
+class ConversionDetailsBuilder:
+    """keyword x tarih dönüşümlerini geldikçe topla
+    
+    Anahtar kelime (reklam grubu ID, kriter ID) ile tanımlanır; her benzersiz
+    anahtar kelime x tarih için tek satır vardır, ham satırlar saklanmadığı için
+    bellek sonuç boyutuyla sınırlıdır. Metin nitelikleri to_frame'de eşlenir.
+    """
+    
+    def __init__(self):
+        self.fetched_rows = 0
+        self.keys = {}
+        self.criteria = {}
+        self.criterion_keys = []
+        self.criterion_codes = array('i')
+        self.dates = DictionaryColumn()
+        self.conversions = array('d')
+        self.conversions_value = array('d')
+    
+    def __len__(self):
+        return len(self.conversions)
+    
+    def append_decoded(self, rows):
+        """CONVERSION_DETAIL_FIELDS sırasındaki değerleri anahtar bazında topla"""
+        for ad_group_id, criterion_id, conversions, conversions_value, date in rows:
+            self.fetched_rows += 1
+            criterion = (ad_group_id, criterion_id)
+            criterion_code = self.criteria.get(criterion)
+            if criterion_code is None:
+                criterion_code = len(self.criterion_keys)
+                self.criteria[criterion] = criterion_code
+                self.criterion_keys.append(criterion)
+            
+            key = (criterion_code, self.dates.encode(date or 'N/A'))
+            index = self.keys.get(key)
+            if index is None:
+                self.keys[key] = len(self.conversions)
+                self.criterion_codes.append(key[0])
+                self.dates.codes.append(key[1])
+                self.conversions.append(conversions or 0.0)
+                self.conversions_value.append(conversions_value or 0.0)
+            else:
+                self.conversions[index] += conversions or 0.0
+                self.conversions_value[index] += conversions_value or 0.0
+    
+    def append_rows(self, rows):
+        """proto-plus satırlarını çözüp topla"""
+        self.append_decoded(
+            (
+                row.ad_group.id,
+                row.ad_group_criterion.criterion_id,
+                row.metrics.conversions,
+                row.metrics.conversions_value,
+                row.segments.date
+            )
+            for row in rows
+        )
+    
+    def to_frame(self, keyword_attributes=None):
+        """Toplanmış satırlardan dönüşüm ve tarihe göre (azalan) sıralı DataFrame oluştur
+        
+        keyword_attributes: (reklam grubu ID, kriter ID) -> (anahtar kelime, eşleşme türü,
+        reklam grubu, kampanya); eşlenemeyen nitelikler 'N/A' olur.
+        """
+        keyword_attributes = keyword_attributes or {}
+        
+        # Nitelikler anahtar kelime başına bir kez kodlanır, satırlara kod dizisiyle yayılır
+        columns = [DictionaryColumn() for _ in range(4)]
+        for criterion in self.criterion_keys:
+            keyword, match_type, ad_group, campaign = keyword_attributes.get(criterion, (None,) * 4)
+            if not match_type or match_type == 'UNSPECIFIED':
+                match_type = None
+            for column, value in zip(columns, (keyword, match_type, ad_group, campaign)):
+                column.append(value or 'N/A')
+        
+        if self.criterion_codes:
+            criterion_codes = np.frombuffer(self.criterion_codes, dtype=np.int32)
+        else:
+            criterion_codes = np.empty(0, dtype=np.int32)
+        keywords, match_types, ad_groups, campaigns = (
+            column.to_categorical()[criterion_codes] for column in columns
+        )
+        
+        df = pd.DataFrame({
+            'Tarih': self.dates.to_categorical(),
+            'Keyword': keywords,
+            'Eşleşme Türü': match_types,
+            'Reklam Grubu': ad_groups,
+            'Kampanya': campaigns,
+            'Dönüşüm Sayısı': np.array(self.conversions, dtype=np.float64),
+            'Dönüşüm Değeri (₺)': np.array(self.conversions_value, dtype=np.float64)
+        })
+        if df.empty:
+            return df
+        
+        # Tarih metni ISO biçiminde olduğu için sözlük sırası kronolojik sıradır
+        date_rank = np.argsort(np.argsort(np.array(self.dates.values, dtype=object)))
+        date_codes = np.frombuffer(self.dates.codes, dtype=np.int32)
+        order = np.lexsort((-date_rank[date_codes], -df['Dönüşüm Sayısı'].to_numpy()))
+        return df.iloc[order].reset_index(drop=True)
+
+
+def micros_to_currency(micros):
+    """Mikro tutarları (int64) gösterim için para birimine çevir"""
+    return np.asarray(micros, dtype=np.int64) / MICROS_PER_UNIT
+
+
+def aggregate_campaigns(daily_df, attributes_df):
+    """Günlük satırları kampanya bazında topla - oranlar toplamlardan bir kez hesaplanır"""
+    totals = daily_df.groupby(CAMPAIGN_ID_COLUMN, sort=True).agg({
+        IMPRESSIONS_COLUMN: 'sum',
+        CLICKS_COLUMN: 'sum',
+        COST_MICROS_COLUMN: 'sum',
+        CONVERSIONS_COLUMN: 'sum'
+    }).reset_index()
+    totals = totals.merge(attributes_df, on=CAMPAIGN_ID_COLUMN, how='left')
+    
+    impressions = totals[IMPRESSIONS_COLUMN].to_numpy()
+    clicks = totals[CLICKS_COLUMN].to_numpy()
+    cost_micros = totals[COST_MICROS_COLUMN].to_numpy()
+    conversions = totals[CONVERSIONS_COLUMN].to_numpy()
+    
+    ctr = np.divide(clicks * 100, impressions, out=np.zeros(len(totals)), where=impressions > 0)
+    cpc = np.divide(cost_micros, clicks, out=np.zeros(len(totals)), where=clicks > 0)
+    cost_per_conversion = np.divide(cost_micros, conversions, out=np.zeros(len(totals)), where=conversions > 0)
+    
+    campaigns = pd.DataFrame({
+        CAMPAIGN_ID_COLUMN: totals[CAMPAIGN_ID_COLUMN],
+        CAMPAIGN_NAME_COLUMN: totals[CAMPAIGN_NAME_COLUMN].fillna('N/A'),
+        STATUS_COLUMN: totals[STATUS_COLUMN].fillna('N/A'),
+        IMPRESSIONS_COLUMN: impressions,
+        CLICKS_COLUMN: clicks,
+        'Maliyet (₺)': micros_to_currency(cost_micros),
+        CONVERSIONS_COLUMN: conversions,
+        'CTR': ctr,
+        'Ortalama CPC (₺)': cpc / MICROS_PER_UNIT,
+        'Dönüşüm Başına Maliyet (₺)': cost_per_conversion / MICROS_PER_UNIT
+    })
+    # Maliyete göre sırala (eşitlikte kampanya ID sırası korunur)
+    return campaigns.sort_values('Maliyet (₺)', ascending=False, kind='stable', ignore_index=True)
+
+
+class CampaignDayMatrix:
+    """Kampanya x gün yoğun metrik matrisi - grafikler için tekrar API çağrısı gerekmez
+    
+    Her metrik (kampanya sayısı, gün sayısı) boyutunda bir dizidir; veri olmayan
+    günler sıfırdır. Para mikro cinsinden int64 tutulur.
+    """
+    
+    METRICS = (IMPRESSIONS_COLUMN, CLICKS_COLUMN, COST_MICROS_COLUMN, CONVERSIONS_COLUMN)
+    
+    def __init__(self, campaign_ids, campaign_names, dates, metrics):
+        self.campaign_ids = campaign_ids
+        self.campaign_names = campaign_names
+        self.dates = dates
+        self.metrics = metrics
+    
+    @classmethod
+    def from_frame(cls, daily_df, attributes_df, start_date, end_date):
+        """Günlük satırları tarih aralığını tam kaplayan matrise yerleştir"""
+        dates = np.arange(
+            np.datetime64(start_date, 'D'),
+            np.datetime64(end_date, 'D') + np.timedelta64(1, 'D')
+        )
+        campaign_ids, rows = np.unique(daily_df[CAMPAIGN_ID_COLUMN].to_numpy(), return_inverse=True)
+        days = (daily_df[DATE_COLUMN].to_numpy().astype('datetime64[D]') - dates[0]).astype(np.int64)
+        in_range = (days >= 0) & (days < len(dates))
+        rows, days = rows[in_range], days[in_range]
+        
+        metrics = {}
+        for column in cls.METRICS:
+            values = daily_df[column].to_numpy()[in_range]
+            matrix = np.zeros((len(campaign_ids), len(dates)), dtype=values.dtype)
+            np.add.at(matrix, (rows, days), values)
+            metrics[column] = matrix
+        
+        names = dict(zip(attributes_df[CAMPAIGN_ID_COLUMN], attributes_df[CAMPAIGN_NAME_COLUMN]))
+        campaign_names = [names.get(campaign_id, str(campaign_id)) for campaign_id in campaign_ids]
+        return cls(campaign_ids, campaign_names, dates, metrics)
+    
+    def _rows(self, campaign_ids=None):
+        if campaign_ids is None:
+            return slice(None)
+        return np.flatnonzero(np.isin(self.campaign_ids, campaign_ids))
+    
+    def get_daily_frame(self, campaign_ids=None):
+        """Seçili kampanyaların günlük toplamları - tarih indeksli, ₺ ve oranlar hesaplanmış"""
+        rows = self._rows(campaign_ids)
+        impressions = self.metrics[IMPRESSIONS_COLUMN][rows].sum(axis=0)
+        clicks = self.metrics[CLICKS_COLUMN][rows].sum(axis=0)
+        cost_micros = self.metrics[COST_MICROS_COLUMN][rows].sum(axis=0)
+        conversions = self.metrics[CONVERSIONS_COLUMN][rows].sum(axis=0)
+        
+        return pd.DataFrame({
+            IMPRESSIONS_COLUMN: impressions,
+            CLICKS_COLUMN: clicks,
+            'Maliyet (₺)': micros_to_currency(cost_micros),
+            CONVERSIONS_COLUMN: conversions,
+            'CTR': np.divide(clicks * 100, impressions, out=np.zeros(len(self.dates)), where=impressions > 0),
+            'Ortalama CPC (₺)': np.divide(cost_micros, clicks, out=np.zeros(len(self.dates)), where=clicks > 0) / MICROS_PER_UNIT
+        }, index=pd.DatetimeIndex(self.dates, name=DATE_COLUMN))
+    
+    def get_sparklines(self, metric=COST_MICROS_COLUMN):
+        """Kampanya ID -> günlük değer listesi (tablo içi mini grafikler için)"""
+        values = self.metrics[metric]
+        if metric == COST_MICROS_COLUMN:
+            values = micros_to_currency(values)
+        return dict(zip(self.campaign_ids.tolist(), values.tolist()))
+
+
+def rolling_mean(values, window):
+    """Kayan ortalama - kümülatif toplamla O(n); ilk günlerde mevcut günlerin ortalaması"""
+    values = np.asarray(values, dtype=np.float64)
+    if window <= 1 or len(values) == 0:
+        return values
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
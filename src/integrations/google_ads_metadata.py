@@ -0,0 +1,273 @@
+"""Google Ads yapı verileri (kampanya, reklam grubu, anahtar kelime) için değişiklik bazlı önbellek
+
+Ad/durum gibi nitelikler metrik sorgularında tekrar çekilmez; müşteri deposunda
+tutulur ve change_status kaynağından son senkrondan bu yana değişen varlıklar
+yeniden sorgulanarak güncellenir.
+"""
+from datetime import datetime, timedelta
+from src.config import GOOGLE_ADS_RESYNC_MINUTES
+
+METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ad_groups (
+    ad_group_id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    ad_group_id INTEGER NOT NULL,
+    criterion_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    match_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (ad_group_id, criterion_id)
+);
+CREATE TABLE IF NOT EXISTS metadata_syncs (
+    scope TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+# Senkron kapsamları ve izledikleri change_status kaynak türleri. Kampanya raporu sadece
+# kampanyaları senkronlar; reklam grubu ve anahtar kelimeler ilk ihtiyaçta yüklenir.
+CAMPAIGN_SCOPE = 'campaigns'
+KEYWORD_SCOPE = 'keywords'
+SCOPE_RESOURCE_TYPES = {
+    CAMPAIGN_SCOPE: ('CAMPAIGN',),
+    KEYWORD_SCOPE: ('AD_GROUP', 'AD_GROUP_CRITERION')
+}
+
+# change_status sadece son 90 günü ve sorgu başına en fazla 10.000 satırı döndürür;
+# sınır aşılırsa tam yükleme yapılır
+CHANGE_STATUS_LIMIT = 10000
+CHANGE_STATUS_MAX_AGE = timedelta(days=89)
+# Değişiklik zamanları hesap saat diliminde; sunucu farkı için pencere bir gün geriden başlatılır
+CHANGE_STATUS_OVERLAP = timedelta(days=1)
+ID_CHUNK_SIZE = 1000
+
+# Kaldırılmış varlıklar da yüklenir - geçmiş metrik satırları adlarıyla gösterilebilsin
+CAMPAIGN_QUERY = """
+    SELECT campaign.id, campaign.name, campaign.status
+    FROM campaign
+"""
+AD_GROUP_QUERY = """
+    SELECT ad_group.id, campaign.id, ad_group.name, ad_group.status
+    FROM ad_group
+"""
+KEYWORD_QUERY = """
+    SELECT
+        ad_group.id,
+        ad_group_criterion.criterion_id,
+        ad_group_criterion.keyword.text,
+        ad_group_criterion.keyword.match_type,
+        ad_group_criterion.status
+    FROM ad_group_criterion
+    WHERE ad_group_criterion.type = 'KEYWORD'
+"""
+
+
+def _change_status_query(since, until, resource_types):
+    resource_types = ', '.join(f"'{resource_type}'" for resource_type in resource_types)
+    return f"""
+        SELECT
+            change_status.resource_type,
+            change_status.campaign,
+            change_status.ad_group,
+            change_status.ad_group_criterion,
+            change_status.last_change_date_time
+        FROM change_status
+        WHERE change_status.last_change_date_time BETWEEN '{since:%Y-%m-%d %H:%M:%S}' AND '{until:%Y-%m-%d %H:%M:%S}'
+        AND change_status.resource_type IN ({resource_types})
+        ORDER BY change_status.last_change_date_time
+        LIMIT {CHANGE_STATUS_LIMIT}
+    """
+
+
+def _chunks(values):
+    values = sorted(values)
+    for start in range(0, len(values), ID_CHUNK_SIZE):
+        yield values[start:start + ID_CHUNK_SIZE]
+
+
+def _store_entities(connection, campaigns=(), ad_groups=(), keywords=()):
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO campaigns (campaign_id, name, status) VALUES (?, ?, ?)",
+            campaigns
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO ad_groups (ad_group_id, campaign_id, name, status) VALUES (?, ?, ?, ?)",
+            ad_groups
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO keywords (ad_group_id, criterion_id, text, match_type, status) "
+            "VALUES (?, ?, ?, ?, ?)",
+            keywords
+        )
+
+
+def _full_sync(connection, search, scope):
+    """Kapsamdaki tüm varlıkları yükle - yüklenen varlık sayısı"""
+    if scope == CAMPAIGN_SCOPE:
+        campaigns = search(CAMPAIGN_QUERY)
+        _store_entities(connection, campaigns=campaigns)
+        return len(campaigns)
+    
+    ad_groups = search(AD_GROUP_QUERY)
+    keywords = search(KEYWORD_QUERY)
+    _store_entities(connection, ad_groups=ad_groups, keywords=keywords)
+    return len(ad_groups) + len(keywords)
+
+
+def _changed_entities(changes):
+    """change_status satırlarından değişen kampanya/reklam grubu ID'leri ve kriter kaynak adları"""
+    campaign_ids = set()
+    ad_group_ids = set()
+    criteria = set()
+    for resource_type, campaign, ad_group, criterion, _ in changes:
+        if resource_type == 'CAMPAIGN' and campaign:
+            campaign_ids.add(int(campaign.rsplit('/', 1)[1]))
+        elif resource_type == 'AD_GROUP' and ad_group:
+            ad_group_ids.add(int(ad_group.rsplit('/', 1)[1]))
+        elif resource_type == 'AD_GROUP_CRITERION' and criterion:
+            criteria.add(criterion)
+    return campaign_ids, ad_group_ids, criteria
+
+
+def _requery_changed(connection, search, changes):
+    """Sadece değişen varlıkları yeniden sorgula - yeniden sorgulanan varlık sayısı"""
+    campaign_ids, ad_group_ids, criteria = _changed_entities(changes)
+    
+    campaigns = []
+    for chunk in _chunks(campaign_ids):
+        campaigns.extend(search(f"{CAMPAIGN_QUERY} WHERE campaign.id IN ({', '.join(map(str, chunk))})"))
+    ad_groups = []
+    for chunk in _chunks(ad_group_ids):
+        ad_groups.extend(search(f"{AD_GROUP_QUERY} WHERE ad_group.id IN ({', '.join(map(str, chunk))})"))
+    keywords = []
+    for chunk in _chunks(criteria):
+        names = ', '.join(f"'{name}'" for name in chunk)
+        keywords.extend(search(f"{KEYWORD_QUERY} AND ad_group_criterion.resource_name IN ({names})"))
+    
+    _store_entities(connection, campaigns, ad_groups, keywords)
+    return len(campaign_ids) + len(ad_group_ids) + len(criteria)
+
+
+def sync_metadata(connection, search, scope=CAMPAIGN_SCOPE):
+    """Yapı önbelleğinin bir kapsamını (kampanyalar ya da reklam grubu + anahtar kelimeler)
+    change_status ile güncelle
+    
+    search(sorgu) SELECT sırasındaki değer tuple'larının listesini döndürmelidir; hatalar
+    çağırana iletilir. Son senkron GOOGLE_ADS_RESYNC_MINUTES içindeyse API'ye gidilmez.
+    İlk senkronda veya change_status penceresi aşıldığında kapsam tamamen yüklenir.
+    Dönüş: yüklenen/yeniden sorgulanan varlık sayısı
+    """
+    now = datetime.now()
+    row = connection.execute("SELECT synced_at FROM metadata_syncs WHERE scope = ?", (scope,)).fetchone()
+    synced_at = datetime.fromisoformat(row[0]) if row else None
+    if synced_at is not None and now - synced_at < timedelta(minutes=GOOGLE_ADS_RESYNC_MINUTES):
+        return 0
+    
+    if synced_at is None or now - synced_at > CHANGE_STATUS_MAX_AGE:
+        changed = _full_sync(connection, search, scope)
+    else:
+        changes = search(_change_status_query(
+            synced_at - CHANGE_STATUS_OVERLAP, now + CHANGE_STATUS_OVERLAP, SCOPE_RESOURCE_TYPES[scope]
+        ))
+        if len(changes) >= CHANGE_STATUS_LIMIT:
+            changed = _full_sync(connection, search, scope)
+        else:
+            changed = _requery_changed(connection, search, changes)
+    
+    # Senkron başlangıç zamanı kaydedilir; sorgular sürerken yapılan değişiklikler sonraki pencerede kalır
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO metadata_syncs (scope, synced_at) VALUES (?, ?)",
+            (scope, now.isoformat(timespec='seconds'))
+        )
+    return changed
+
+
+def _unknown_ids(connection, table, column, ids):
+    """ids içinden tabloda kaydı olmayanlar"""
+    ids = set(ids)
+    if not ids:
+        return set()
+    known = set()
+    for chunk in _chunks(ids):
+        cursor = connection.execute(
+            f"SELECT {column} FROM {table} WHERE {column} IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        known.update(row[0] for row in cursor)
+    return ids - known
+
+
+def fetch_missing_entities(connection, search, campaign_ids=(), criteria=()):
+    """Önbellekte olmayan kampanya ve anahtar kelimeleri ID ile doğrudan sorgulayıp kaydet
+    
+    change_status yalnızca değişen varlıkları listeler; hiç değişmemiş ama önbellekte
+    olmayan varlıklar bu yolla eklenir. Anahtar kelimelerin reklam grubu ve kampanyası
+    da eksikse birlikte çekilir. API'nin döndürmediği ID'ler 'N/A' olarak kaydedilir,
+    sonraki isteklerde tekrar sorgulanmaz.
+    Dönüş: sorgulanan varlık sayısı
+    """
+    keywords = []
+    for chunk in _chunks(set(criteria)):
+        ad_group_ids = ', '.join(map(str, sorted({ad_group_id for ad_group_id, _ in chunk})))
+        criterion_ids = ', '.join(map(str, sorted({criterion_id for _, criterion_id in chunk})))
+        keywords.extend(search(
+            f"{KEYWORD_QUERY} AND ad_group.id IN ({ad_group_ids}) "
+            f"AND ad_group_criterion.criterion_id IN ({criterion_ids})"
+        ))
+    found = {(row[0], row[1]) for row in keywords}
+    keywords.extend(
+        (ad_group_id, criterion_id, 'N/A', 'UNSPECIFIED', 'UNKNOWN')
+        for ad_group_id, criterion_id in set(criteria) - found
+    )
+    
+    missing_ad_groups = _unknown_ids(connection, 'ad_groups', 'ad_group_id', (row[0] for row in keywords))
+    ad_groups = []
+    for chunk in _chunks(missing_ad_groups):
+        ad_groups.extend(search(f"{AD_GROUP_QUERY} WHERE ad_group.id IN ({', '.join(map(str, chunk))})"))
+    found = {row[0] for row in ad_groups}
+    ad_groups.extend((ad_group_id, 0, 'N/A', 'UNKNOWN') for ad_group_id in missing_ad_groups - found)
+    
+    missing_campaigns = _unknown_ids(
+        connection, 'campaigns', 'campaign_id',
+        set(campaign_ids) | {row[1] for row in ad_groups if row[1]}
+    )
+    campaigns = []
+    for chunk in _chunks(missing_campaigns):
+        campaigns.extend(search(f"{CAMPAIGN_QUERY} WHERE campaign.id IN ({', '.join(map(str, chunk))})"))
+    found = {row[0] for row in campaigns}
+    campaigns.extend((campaign_id, 'N/A', 'UNKNOWN') for campaign_id in missing_campaigns - found)
+    
+    _store_entities(connection, campaigns, ad_groups, keywords)
+    return len(set(criteria)) + len(missing_ad_groups) + len(missing_campaigns)
+
+
+def read_keyword_attributes(connection, criteria):
+    """(reklam grubu ID, kriter ID) -> (anahtar kelime, eşleşme türü, reklam grubu, kampanya) sözlüğü"""
+    connection.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_criteria (ad_group_id INTEGER, criterion_id INTEGER)")
+    with connection:
+        connection.execute("DELETE FROM wanted_criteria")
+        connection.executemany("INSERT INTO wanted_criteria (ad_group_id, criterion_id) VALUES (?, ?)", criteria)
+    cursor = connection.execute(
+        """
+        SELECT k.ad_group_id, k.criterion_id, k.text, k.match_type, g.name, c.name
+        FROM wanted_criteria w
+        JOIN keywords k ON k.ad_group_id = w.ad_group_id AND k.criterion_id = w.criterion_id
+        LEFT JOIN ad_groups g ON g.ad_group_id = k.ad_group_id
+        LEFT JOIN campaigns c ON c.campaign_id = g.campaign_id
+        """
+    )
+    return {
+        (ad_group_id, criterion_id): (text, match_type, ad_group, campaign)
+        for ad_group_id, criterion_id, text, match_type, ad_group, campaign in cursor
+    }
@@ -0,0 +1,128 @@
+"""Google Ads client havuzu - credential başına tek client, gRPC kanalı ve token yeniden kullanımı"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from google.ads.googleads.client import GoogleAdsClient
+from google.auth.transport.requests import Request
+
+REFRESH_MARGIN_SECONDS = 300
+REFRESH_CHECK_INTERVAL = 60
+MAX_POOLED_CLIENTS = 32
+
+
+def get_client_pool_key(refresh_token, developer_token):
+    """Havuz anahtarı üret (token değerleri açıkça saklanmaz)"""
+    return hashlib.sha256(f"{developer_token}:{refresh_token}".encode('utf-8')).hexdigest()
+
+
+class PooledGoogleAdsClient(GoogleAdsClient):
+    """Servisleri (ve altındaki gRPC kanallarını) bir kez oluşturup yeniden kullanan client
+
+    GoogleAdsClient.get_service her çağrıda yeni kanal açar; burada servis adı ve
+    sürüm başına tek servis tutulur. gRPC kanalları thread-safe'tir.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._services = {}
+        self._services_lock = threading.Lock()
+
+    def get_service(self, name, version=None, interceptors=None, is_async=False):
+        # Özel interceptor'lı servisler paylaşılmaz
+        if interceptors:
+            return super().get_service(name, version or self.version, interceptors, is_async)
+
+        key = (name, version, is_async)
+        with self._services_lock:
+            service = self._services.get(key)
+            if service is None:
+                if version:
+                    service = super().get_service(name, version, is_async=is_async)
+                else:
+                    service = super().get_service(name, is_async=is_async)
+                self._services[key] = service
+            return service
+
+
+class GoogleAdsClientPool:
+    """Süreç genelinde credential başına GoogleAdsClient havuzu
+
+    Client'lar rerun'lar ve oturumlar arasında paylaşılır; arka plan thread'i
+    süresi dolmak üzere olan token'ları istek beklemeden yeniler. Yenileme
+    başarısız olursa (iptal edilmiş token) client havuzdan çıkarılır.
+
+    Aynı credential'ı kullanan oturumlar aynı client'ı paylaştığı için havuzdan
+    çıkarma kanalları kapatmaz; client'ı hâlâ kullanan oturum akışını tamamlar,
+    kanallar son referans bırakılınca çöp toplayıcıyla kapanır.
+    """
+
+    def __init__(self, max_clients=MAX_POOLED_CLIENTS, refresh_margin=REFRESH_MARGIN_SECONDS,
+                 check_interval=REFRESH_CHECK_INTERVAL):
+        self.max_clients = max_clients
+        self.refresh_margin = refresh_margin
+        self.check_interval = check_interval
+        self.clients = OrderedDict()
+        self.lock = threading.Lock()
+        self.refresher = None
+
+    def get(self, config):
+        """Config için havuzdaki client'ı döndür, yoksa oluştur - (anahtar, client)"""
+        key = get_client_pool_key(config['refresh_token'], config['developer_token'])
+        with self.lock:
+            client = self.clients.get(key)
+            if client is not None:
+                self.clients.move_to_end(key)
+                return key, client
+
+        # Oluşturma (ilk token alımı dahil) kilit dışında yapılır, diğer kullanıcılar beklemez
+        client = PooledGoogleAdsClient.load_from_dict(config)
+
+        with self.lock:
+            existing = self.clients.get(key)
+            if existing is not None:
+                # Eşzamanlı oluşturulan kopya henüz servis açmadı, atılır
+                client = existing
+            else:
+                self.clients[key] = client
+                while len(self.clients) > self.max_clients:
+                    self.clients.popitem(last=False)
+            self._ensure_refresher()
+        return key, client
+
+    def evict(self, key):
+        """Client'ı havuzdan çıkar - kanallar kapatılmaz, kullanan oturumlar etkilenmez"""
+        with self.lock:
+            self.clients.pop(key, None)
+
+    def refresh_expiring(self):
+        """Süresi refresh_margin içinde dolacak token'ları yenile"""
+        with self.lock:
+            entries = list(self.clients.items())
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for key, client in entries:
+            credentials = client.credentials
+            expiry = getattr(credentials, 'expiry', None)
+            if expiry is not None and (expiry - now).total_seconds() > self.refresh_margin:
+                continue
+            try:
+                credentials.refresh(Request())
+            except Exception:
+                self.evict(key)
+
+    def _ensure_refresher(self):
+        # Kilit altında çağrılır
+        if self.refresher is None or not self.refresher.is_alive():
+            self.refresher = threading.Thread(target=self._refresh_loop, name='google-ads-token-refresh', daemon=True)
+            self.refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            self.refresh_expiring()
+
+
+# Streamlit modülleri bir kez yüklediği için havuz tüm oturumlarda paylaşılır
+google_ads_client_pool = GoogleAdsClientPool()
@@ -0,0 +1,217 @@
+"""Google Ads günlük kampanya metrikleri için müşteri bazlı kalıcı depo"""
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.config import GOOGLE_ADS_RESTATEMENT_DAYS, GOOGLE_ADS_RESYNC_MINUTES
+from src.integrations.google_ads_frame import (
+    CAMPAIGN_ID_COLUMN,
+    CAMPAIGN_NAME_COLUMN,
+    STATUS_COLUMN,
+    DATE_COLUMN,
+    IMPRESSIONS_COLUMN,
+    CLICKS_COLUMN,
+    COST_MICROS_COLUMN,
+    CONVERSIONS_COLUMN
+)
+from src.integrations.google_ads_metadata import (
+    METADATA_SCHEMA,
+    CAMPAIGN_SCOPE,
+    KEYWORD_SCOPE,
+    sync_metadata,
+    fetch_missing_entities,
+    read_keyword_attributes
+)
+from src.utils.local_store import connect_store
+
+STORE_NAMESPACE = 'google_ads'
+# Günler sunucu tarihine göre kesinleşir; hesap saat dilimi sunucudan en fazla bir gün
+# geride olabileceği için pencere bir gün uzatılır (hesabın "bugün"ü erken kesinleşmesin)
+TIMEZONE_MARGIN_DAYS = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_days (
+    day TEXT NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    cost_micros INTEGER NOT NULL,
+    conversions REAL NOT NULL,
+    PRIMARY KEY (day, campaign_id)
+);
+CREATE TABLE IF NOT EXISTS days (
+    day TEXT PRIMARY KEY,
+    fetched_at TEXT NOT NULL,
+    final INTEGER NOT NULL
+);
+""" + METADATA_SCHEMA
+
+
+def get_days_to_sync(connection, start_date, end_date, force_resync=False):
+    """Çekilmesi gereken günler - hiç çekilmemiş günler ve süresi geçmiş düzeltme penceresi günleri
+    
+    force_resync=True düzeltme penceresindeki tüm günleri yeniden senkron süresini beklemeden döndürür.
+    """
+    cursor = connection.execute(
+        "SELECT day, fetched_at, final FROM days WHERE day BETWEEN ? AND ?",
+        (start_date.isoformat(), end_date.isoformat())
+    )
+    stored = {day: (fetched_at, final) for day, fetched_at, final in cursor}
+    resync_before = (datetime.now() - timedelta(minutes=GOOGLE_ADS_RESYNC_MINUTES)).isoformat(timespec='seconds')
+    
+    days = []
+    day = start_date
+    while day <= end_date:
+        entry = stored.get(day.isoformat())
+        if entry is None or (not entry[1] and (force_resync or entry[0] < resync_before)):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def group_contiguous_days(days):
+    """Sıralı gün listesini ardışık (başlangıç, bitiş) aralıklarına böl - aralık başına tek sorgu"""
+    ranges = []
+    for day in days:
+        if ranges and day - ranges[-1][1] == timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def store_campaign_days(connection, start_date, end_date, builder):
+    """Bir aralığın günlük satırlarını depoya yaz (aralığın eski kayıtlarının yerine)
+    
+    Veri gelmeyen günler de çekildi olarak işaretlenir, tekrar istenmez.
+    """
+    today = datetime.now().date()
+    fetched_at = datetime.now().isoformat(timespec='seconds')
+    daily_df = builder.to_frame()
+    
+    days = []
+    day = start_date
+    while day <= end_date:
+        final = (today - day).days > GOOGLE_ADS_RESTATEMENT_DAYS + TIMEZONE_MARGIN_DAYS
+        days.append((day.isoformat(), fetched_at, int(final)))
+        day += timedelta(days=1)
+    
+    with connection:
+        connection.execute(
+            "DELETE FROM campaign_days WHERE day BETWEEN ? AND ?",
+            (start_date.isoformat(), end_date.isoformat())
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO campaign_days "
+            "(day, campaign_id, impressions, clicks, cost_micros, conversions) VALUES (?, ?, ?, ?, ?, ?)",
+            zip(
+                daily_df[DATE_COLUMN].dt.strftime('%Y-%m-%d').tolist(),
+                daily_df[CAMPAIGN_ID_COLUMN].tolist(),
+                daily_df[IMPRESSIONS_COLUMN].tolist(),
+                daily_df[CLICKS_COLUMN].tolist(),
+                daily_df[COST_MICROS_COLUMN].tolist(),
+                daily_df[CONVERSIONS_COLUMN].tolist()
+            )
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO days (day, fetched_at, final) VALUES (?, ?, ?)",
+            days
+        )
+
+
+def read_campaign_days(connection, start_date, end_date):
+    """Depodaki aralığın günlük satırları ve kampanya adları - (günlük DataFrame, nitelik DataFrame)"""
+    cursor = connection.execute(
+        """
+        SELECT campaign_id, day, impressions, clicks, cost_micros, conversions
+        FROM campaign_days
+        WHERE day BETWEEN ? AND ?
+        ORDER BY campaign_id, day
+        """,
+        (start_date.isoformat(), end_date.isoformat())
+    )
+    rows = cursor.fetchall()
+    campaign_ids, days, impressions, clicks, cost_micros, conversions = zip(*rows) if rows else ([],) * 6
+    
+    daily_df = pd.DataFrame({
+        CAMPAIGN_ID_COLUMN: np.array(campaign_ids, dtype=np.int64),
+        DATE_COLUMN: np.array(days, dtype='datetime64[D]'),
+        IMPRESSIONS_COLUMN: np.array(impressions, dtype=np.int64),
+        CLICKS_COLUMN: np.array(clicks, dtype=np.int64),
+        COST_MICROS_COLUMN: np.array(cost_micros, dtype=np.int64),
+        CONVERSIONS_COLUMN: np.array(conversions, dtype=np.float64)
+    })
+    
+    attributes_df = pd.DataFrame(
+        connection.execute(
+            """
+            SELECT campaign_id, name, status FROM campaigns
+            WHERE campaign_id IN (SELECT DISTINCT campaign_id FROM campaign_days WHERE day BETWEEN ? AND ?)
+            """,
+            (start_date.isoformat(), end_date.isoformat())
+        ).fetchall(),
+        columns=[CAMPAIGN_ID_COLUMN, CAMPAIGN_NAME_COLUMN, STATUS_COLUMN]
+    )
+    return daily_df, attributes_df
+
+
+def sync_campaign_days(connection, fetch_range, start_date, end_date, force_resync=False):
+    """Aralıktaki eksik/güncellenecek günleri ardışık aralıklar halinde çekip depoya yaz
+    
+    fetch_range(başlangıç, bitiş) CampaignDailyBuilder döndürmelidir; hatalar çağırana iletilir.
+    Dönüş: API'den çekilen gün sayısı
+    """
+    days = get_days_to_sync(connection, start_date, end_date, force_resync)
+    for range_start, range_end in group_contiguous_days(days):
+        store_campaign_days(connection, range_start, range_end, fetch_range(range_start, range_end))
+    return len(days)
+
+
+def _unknown_campaigns(connection, start_date, end_date):
+    """Aralıkta yapı önbelleğinde adı olmayan kampanya ID'leri"""
+    cursor = connection.execute(
+        """
+        SELECT DISTINCT campaign_id FROM campaign_days
+        WHERE day BETWEEN ? AND ?
+        AND campaign_id NOT IN (SELECT campaign_id FROM campaigns)
+        """,
+        (start_date.isoformat(), end_date.isoformat())
+    )
+    return [row[0] for row in cursor]
+
+
+def get_stored_campaign_days(customer_id, fetch_range, search, start_date, end_date, force_resync=False):
+    """Müşteri deposunu senkronize edip aralığı oku - (günlük DataFrame, nitelik DataFrame, çekilen gün sayısı)
+    
+    Kampanya adları yapı önbelleğinden gelir; önbellekte olmayan kampanyalar
+    ID ile doğrudan sorgulanır.
+    """
+    connection = connect_store(STORE_NAMESPACE, customer_id, SCHEMA)
+    try:
+        fetched_days = sync_campaign_days(connection, fetch_range, start_date, end_date, force_resync)
+        sync_metadata(connection, search, CAMPAIGN_SCOPE)
+        unknown_campaigns = _unknown_campaigns(connection, start_date, end_date)
+        if unknown_campaigns:
+            fetch_missing_entities(connection, search, campaign_ids=unknown_campaigns)
+        daily_df, attributes_df = read_campaign_days(connection, start_date, end_date)
+        return daily_df, attributes_df, fetched_days
+    finally:
+        connection.close()
+
+
+def get_stored_keyword_attributes(customer_id, search, criteria):
+    """(reklam grubu ID, kriter ID) listesinin anahtar kelime niteliklerini yapı önbelleğinden oku
+    
+    Reklam grubu ve anahtar kelime kapsamı ilk kez burada yüklenir; kampanya raporu bunları çekmez.
+    """
+    connection = connect_store(STORE_NAMESPACE, customer_id, SCHEMA)
+    try:
+        sync_metadata(connection, search, CAMPAIGN_SCOPE)
+        sync_metadata(connection, search, KEYWORD_SCOPE)
+        attributes = read_keyword_attributes(connection, criteria)
+        missing = [criterion for criterion in criteria if criterion not in attributes]
+        if missing:
+            fetch_missing_entities(connection, search, criteria=missing)
+            attributes = read_keyword_attributes(connection, criteria)
+        return attributes
+    finally:
+        connection.close()
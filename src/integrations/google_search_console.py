@@ -1,5 +1,9 @@
 """Google Search Console entegrasyonu"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httplib2
 import streamlit as st
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
@@ -11,6 +15,28 @@ from src.config import (
     REDIRECT_URI,
     SCOPES
 )
+from src.integrations.rate_limit import call_with_backoff, search_console_limiter
+from src.utils.cache_keys import get_credentials_cache_key
+from src.utils.date_utils import split_date_range
+
+MAX_ROWS_PER_PAGE = 25000  # Google API maksimum limiti
+MAX_START_ROW = 2500000  # Search Console'un erişilebilir satır sınırı
+PARALLEL_WORKERS = 4  # Paralel sayfalama için eşzamanlı istek sayısı
+PORTFOLIO_WORKERS = 8  # Portföy modunda eşzamanlı çekilen mülk sayısı
+SEARCH_DIMENSIONS = ['query', 'page']
+SITES_CACHE_TTL = 300  # Site listesi önbellek süresi (saniye)
+
+# Filtre anahtarı -> (API boyutu, operatör)
+FILTER_OPERATORS = {
+    'page_contains': ('page', 'contains'),
+    'page_regex': ('page', 'includingRegex'),
+    'query_contains': ('query', 'contains'),
+    'query_not_contains': ('query', 'notContains'),
+    'country': ('country', 'equals'),
+    'device': ('device', 'equals')
+}
+
+_thread_local = threading.local()
 
 
 def get_flow():
@@ -52,13 +78,42 @@ def save_credentials(credentials):
 
 
 def get_search_console_service(credentials):
-    """Search Console API servisini oluştur"""
-    return build('searchconsole', 'v1', credentials=credentials)
+    """Search Console API servisini oluştur - oturum başına bir kez, statik discovery belgesiyle
+    
+    Servisin httplib2.Http nesnesi thread-safe olmadığı için servis oturumlar
+    arasında paylaşılmaz; aynı oturumun yeniden çalıştırmalarında tekrar kullanılır.
+    """
+    credentials_key = get_credentials_cache_key(credentials)
+    cached = st.session_state.get('search_console_service')
+    if cached is not None and cached[0] == credentials_key:
+        return cached[1]
+    
+    service = build(
+        'searchconsole',
+        'v1',
+        credentials=credentials,
+        static_discovery=True,
+        cache_discovery=False
+    )
+    st.session_state['search_console_service'] = (credentials_key, service)
+    return service
 
 
-def list_sites(service):
-    """Kullanıcının Search Console'daki sitelerini listele"""
+@st.cache_data(show_spinner=False, ttl=SITES_CACHE_TTL)
+def _fetch_site_entries(cache_key, _service):
+    """Site listesini API'den çek - sonuç TTL süresince önbellekte tutulur"""
+    sites = _service.sites().list().execute()
+    return sites.get('siteEntry', [])
+
+
+def list_sites(service, cache_key=None):
+    """Kullanıcının Search Console'daki sitelerini listele
+    
+    cache_key verilirse (bkz. get_credentials_cache_key) liste TTL süresince önbellekten döner.
+    """
     try:
+        if cache_key:
+            return _fetch_site_entries(cache_key, service)
         sites = service.sites().list().execute()
         return sites.get('siteEntry', [])
     except HttpError as error:
@@ -66,55 +121,370 @@ def list_sites(service):
         return []
 
 
-def get_search_analytics(service, site_url, start_date, end_date, row_limit=25000):
-    """Search Console'dan analitik verileri çek - Tüm sayfaları çeker"""
-    all_rows = []
-    start_row = 0
-    max_rows_per_page = 25000  # Google API maksimum limiti
+def _get_thread_http(http):
+    """Çalışan thread için ayrı yetkili HTTP nesnesi döndür (httplib2 thread-safe değil)"""
+    credentials = getattr(http, 'credentials', None)
+    if credentials is None:
+        return http
     
-    try:
+    cached = getattr(_thread_local, 'http', None)
+    if cached is None or cached.credentials is not credentials:
+        cached = AuthorizedHttp(credentials, http=httplib2.Http())
+        _thread_local.http = cached
+    return cached
+
+
+def build_dimension_filter_groups(filters):
+    """Filtre ifadesini API dimensionFilterGroups yapısına çevir
+    
+    Desteklenen anahtarlar: page_contains, page_regex, query_contains,
+    query_not_contains, country (ISO 3166-1 alpha-3, örn. 'tur'), device
+    (DESKTOP/MOBILE/TABLET). Tüm filtreler AND ile birleştirilir.
+    """
+    if not filters:
+        return None
+    
+    api_filters = []
+    for key, value in filters.items():
+        if not value:
+            continue
+        if key not in FILTER_OPERATORS:
+            raise ValueError(f"Desteklenmeyen filtre: {key}")
+        dimension, operator = FILTER_OPERATORS[key]
+        if dimension == 'country':
+            value = value.lower()
+        elif dimension == 'device':
+            value = value.upper()
+        api_filters.append({
+            'dimension': dimension,
+            'operator': operator,
+            'expression': value
+        })
+    
+    if not api_filters:
+        return None
+    return [{'groupType': 'and', 'filters': api_filters}]
+
+
+def _fetch_page(service, site_url, start_date, end_date, start_row, row_limit, thread_safe=False, filters=None):
+    """Tek bir startRow penceresini çek"""
+    request = {
+        'startDate': start_date.strftime('%Y-%m-%d'),
+        'endDate': end_date.strftime('%Y-%m-%d'),
+        'dimensions': SEARCH_DIMENSIONS,
+        'rowLimit': row_limit,
+        'startRow': start_row
+    }
+    filter_groups = build_dimension_filter_groups(filters)
+    if filter_groups:
+        request['dimensionFilterGroups'] = filter_groups
+    
+    query = service.searchanalytics().query(siteUrl=site_url, body=request)
+    http = _get_thread_http(query.http) if thread_safe else None
+    # Kota paylaşılır; 429/5xx hatalarında aynı sayfa beklenip tekrar denenir
+    response = call_with_backoff(
+        lambda: query.execute(http=http) if http else query.execute(),
+        limiter=search_console_limiter,
+        site_url=site_url
+    )
+    return response.get('rows', [])
+
+
+def _page_limit(start_row, row_limit):
+    """startRow konumundaki sayfa için istenecek satır sayısını hesapla"""
+    if start_row >= MAX_START_ROW:
+        return 0
+    if row_limit:
+        return max(0, min(MAX_ROWS_PER_PAGE, row_limit - start_row))
+    return MAX_ROWS_PER_PAGE
+
+
+def _iter_pages_serial(service, site_url, start_date, end_date, row_limit, thread_safe=False,
+                       start_row=0, filters=None):
+    """Sayfaları sırayla tek tek çek"""
+    while True:
+        current_limit = _page_limit(start_row, row_limit)
+        if current_limit == 0:
+            break
+        
+        rows = _fetch_page(
+            service, site_url, start_date, end_date, start_row, current_limit, thread_safe, filters
+        )
+        
+        if not rows:
+            break
+        
+        yield rows
+        
+        if len(rows) < current_limit:
+            break
+        
+        start_row += len(rows)
+
+
+def _iter_pages_parallel(service, site_url, start_date, end_date, row_limit, max_workers,
+                         start_row=0, filters=None):
+    """İlk sayfayı yokla, sonraki startRow pencerelerini thread havuzunda paralel çek"""
+    # İlk sayfa: veri tek sayfaya sığıyorsa paralel isteğe gerek yok
+    first_limit = _page_limit(start_row, row_limit)
+    if first_limit == 0:
+        return
+    
+    rows = _fetch_page(service, site_url, start_date, end_date, start_row, first_limit, filters=filters)
+    if not rows:
+        return
+    
+    yield rows
+    
+    if len(rows) < first_limit:
+        return
+    
+    start_row += len(rows)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         while True:
-            # Her sayfada maksimum 25,000 satır çek
-            if row_limit:
-                current_limit = min(max_rows_per_page, row_limit - len(all_rows))
-            else:
-                current_limit = max_rows_per_page
-            
-            request = {
-                'startDate': start_date.strftime('%Y-%m-%d'),
-                'endDate': end_date.strftime('%Y-%m-%d'),
-                'dimensions': ['query', 'page'],
-                'rowLimit': current_limit,
-                'startRow': start_row
-            }
-            
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
+            # Her turda en fazla max_workers pencere gönder
+            windows = []
+            while len(windows) < max_workers:
+                current_limit = _page_limit(start_row, row_limit)
+                if current_limit == 0:
+                    break
+                windows.append((start_row, current_limit))
+                start_row += current_limit
             
-            rows = response.get('rows', [])
-            
-            if not rows:
+            if not windows:
                 break
             
-            all_rows.extend(rows)
+            futures = [
+                executor.submit(
+                    _fetch_page, service, site_url, start_date, end_date,
+                    window_start, window_limit, True, filters
+                )
+                for window_start, window_limit in windows
+            ]
             
-            if len(rows) < request['rowLimit']:
-                break
+            # Sonuçları startRow sırasıyla birleştir, kısa sayfa görülünce dur
+            finished = False
+            for (window_start, window_limit), future in zip(windows, futures):
+                rows = future.result()
+                if finished:
+                    continue
+                if rows:
+                    yield rows
+                if len(rows) < window_limit:
+                    finished = True
             
-            if row_limit and len(all_rows) >= row_limit:
+            if finished:
                 break
+
+
+def _fetch_shard(service, site_url, shard_start, shard_end, row_limit, filters=None):
+    """Tek bir tarih dilimini kendi sayfalamasıyla çek"""
+    rows = []
+    for page in _iter_pages_serial(
+        service, site_url, shard_start, shard_end, row_limit, True, filters=filters
+    ):
+        rows.extend(page)
+    return rows
+
+
+def iter_shard_rows(service, site_url, date_ranges, row_limit, max_workers, filters=None, errors=None):
+    """Tarih dilimlerini thread havuzunda eşzamanlı çek, tamamlandıkça (başlangıç, satırlar) döndür
+    
+    errors listesi verilirse başarısız dilimler (başlangıç, bitiş, hata) olarak eklenir ve
+    diğer dilimler çekilmeye devam eder; verilmezse ilk hata çağırana iletilir.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _fetch_shard, service, site_url, shard_start, shard_end, row_limit, filters
+            ): (shard_start, shard_end)
+            for shard_start, shard_end in date_ranges
+        }
+        for future in as_completed(futures):
+            shard_start, shard_end = futures[future]
+            if errors is None:
+                yield shard_start, future.result()
+                continue
+            try:
+                rows = future.result()
+            except Exception as error:
+                errors.append((shard_start, shard_end, error))
+                continue
+            yield shard_start, rows
+
+
+def aggregate_rows(row_lists):
+    """Dilim satırlarını keys bazında birleştir - pozisyon gösterim ağırlıklı hesaplanır"""
+    totals = {}
+    
+    for rows in row_lists:
+        for row in rows:
+            key = tuple(row.get('keys', []))
+            clicks = row.get('clicks', 0)
+            impressions = row.get('impressions', 0)
+            position = row.get('position')
             
-            start_row += len(rows)
-            
-            if start_row >= 2500000:
-                break
+            if key not in totals:
+                totals[key] = [0, 0, 0.0, 0]
+            total = totals[key]
+            total[0] += clicks
+            total[1] += impressions
+            # Pozisyonu olmayan satırlar ortalamaya (paydaya da) katılmaz
+            if position is not None:
+                total[2] += position * impressions
+                total[3] += impressions
+    
+    aggregated = []
+    for key, (clicks, impressions, weighted_position, position_impressions) in totals.items():
+        aggregated.append({
+            'keys': list(key),
+            'clicks': clicks,
+            'impressions': impressions,
+            'ctr': clicks / impressions if impressions > 0 else 0,
+            'position': weighted_position / position_impressions if position_impressions > 0 else None
+        })
+    
+    aggregated.sort(key=lambda row: row['clicks'], reverse=True)
+    return aggregated
+
+
+def _get_sharded_search_analytics(service, site_url, start_date, end_date, row_limit, max_workers,
+                                  shard, filters=None):
+    """Tarih dilimlerini eşzamanlı çekip yerel olarak birleştir
+    
+    Başarısız dilimler diğerlerini düşürmez; sonuç eksikse çekilemeyen tarih aralıkları bildirilir.
+    """
+    shard_rows = []
+    errors = []
+    date_ranges = split_date_range(start_date, end_date, shard)
+    
+    try:
+        for _, rows in iter_shard_rows(
+            service, site_url, date_ranges, row_limit, max_workers, filters, errors=errors
+        ):
+            shard_rows.append(rows)
+    except Exception as error:
+        st.error(f"Beklenmeyen hata: {error}")
+    
+    if errors:
+        st.error(f"Veri çekilirken hata oluştu: {errors[0][2]}")
+        failed_ranges = ", ".join(
+            f"{shard_start.strftime('%d.%m.%Y')}-{shard_end.strftime('%d.%m.%Y')}"
+            for shard_start, shard_end, _ in sorted(errors, key=lambda failed: failed[0])
+        )
+        st.warning(
+            f"⚠️ Sonuç eksik: {len(errors)}/{len(date_ranges)} dilim çekilemedi ({failed_ranges}). "
+            f"Diğer dilimlerin {sum(len(rows) for rows in shard_rows)} satırı birleştirildi."
+        )
+    
+    aggregated = aggregate_rows(shard_rows)
+    if row_limit:
+        aggregated = aggregated[:row_limit]
+    return aggregated
+
+
+def iter_search_analytics(service, site_url, start_date, end_date, row_limit=None,
+                          parallel=False, max_workers=PARALLEL_WORKERS, start_row=0, filters=None):
+    """Analitik verileri sayfa sayfa döndüren generator - bellekte tek sayfa tutulur
+    
+    Hatalar çağırana iletilir; o ana kadar dönen sayfalar geçerlidir ve
+    start_row ile kaldığı yerden devam edilebilir. filters API tarafında
+    uygulanır (bkz. build_dimension_filter_groups).
+    """
+    if parallel:
+        return _iter_pages_parallel(
+            service, site_url, start_date, end_date, row_limit, max_workers, start_row, filters
+        )
+    return _iter_pages_serial(
+        service, site_url, start_date, end_date, row_limit, start_row=start_row, filters=filters
+    )
+
+
+def get_search_analytics(service, site_url, start_date, end_date, row_limit=25000,
+                         parallel=False, max_workers=PARALLEL_WORKERS, shard=None, start_row=0,
+                         filters=None):
+    """Search Console'dan analitik verileri çek - Tüm sayfaları çeker
+    
+    parallel=True ise ilk sayfadan sonraki startRow pencereleri sınırlı bir
+    thread havuzunda eşzamanlı çekilir ve sonuçlar sırasıyla birleştirilir.
+    shard='day' veya 'week' verilirse tarih aralığı alt aralıklara bölünür,
+    her dilim eşzamanlı çekilip query+page bazında yeniden birleştirilir.
+    Hata durumunda kısmi sonuç döner ve devam edilecek startRow bildirilir.
+    filters verilirse (sayfa/sorgu içerir, regex, ülke, cihaz) API'ye
+    dimensionFilterGroups olarak gönderilir.
+    """
+    if shard:
+        return _get_sharded_search_analytics(
+            service, site_url, start_date, end_date, row_limit, max_workers, shard, filters
+        )
+    
+    all_rows = []
+    
+    try:
+        for rows in iter_search_analytics(
+            service, site_url, start_date, end_date, row_limit, parallel, max_workers, start_row, filters
+        ):
+            all_rows.extend(rows)
         
         return all_rows
     except HttpError as error:
         st.error(f"Veri çekilirken hata oluştu: {error}")
-        return all_rows
     except Exception as error:
         st.error(f"Beklenmeyen hata: {error}")
-        return all_rows
+    
+    st.warning(
+        f"⚠️ Sonuç eksik: {len(all_rows)} satır alındı. "
+        f"startRow={start_row + len(all_rows)} noktasından devam edilebilir."
+    )
+    return all_rows
+
+
+def _fetch_site_totals(service, site_url, start_date, end_date):
+    """Bir mülkün aralık toplamlarını boyutsuz tek istekle çek"""
+    request = {
+        'startDate': start_date.strftime('%Y-%m-%d'),
+        'endDate': end_date.strftime('%Y-%m-%d')
+    }
+    query = service.searchanalytics().query(siteUrl=site_url, body=request)
+    http = _get_thread_http(query.http)
+    response = call_with_backoff(
+        lambda: query.execute(http=http),
+        limiter=search_console_limiter,
+        site_url=site_url
+    )
+    rows = response.get('rows', [])
+    return rows[0] if rows else {}
+
+
+def get_portfolio_analytics(service, site_urls, start_date, end_date, max_workers=PORTFOLIO_WORKERS):
+    """Tüm mülklerin toplamlarını sınırlı thread havuzunda eşzamanlı çek
+    
+    Dönüş: (mülk bazında özet satırları, hatalar)
+    """
+    portfolio_data = []
+    errors = []
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_site_totals, service, site_url, start_date, end_date): site_url
+            for site_url in site_urls
+        }
+        for future in as_completed(futures):
+            site_url = futures[future]
+            try:
+                totals = future.result()
+            except Exception as error:
+                errors.append({'site_url': site_url, 'error': str(error)})
+                continue
+            
+            portfolio_data.append({
+                'Mülk': site_url,
+                'Tıklama': totals.get('clicks', 0),
+                'Gösterim': totals.get('impressions', 0),
+                'CTR': totals.get('ctr', 0),
+                'Ortalama Pozisyon': totals.get('position')
+            })
+    
+    portfolio_data.sort(key=lambda row: row['Tıklama'], reverse=True)
+    return portfolio_data, errors
@@ -0,0 +1,96 @@
+"""API çağrıları için süreç genelinde hız sınırlama ve yeniden deneme"""
+import random
+import threading
+import time
+from googleapiclient.errors import HttpError
+from src.config import (
+    SEARCH_CONSOLE_PROJECT_QPM,
+    SEARCH_CONSOLE_SITE_QPM
+)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = ('quotaexceeded', 'ratelimitexceeded', 'userratelimitexceeded')
+
+
+class TokenBucket:
+    """Dakikalık kota için token bucket - acquire() token yoksa bekler"""
+    
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 6)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, tokens=1):
+        """Token al, yeterli token yoksa dolana kadar bekle"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Proje geneli ve site bazlı token bucket'ları birlikte uygula"""
+    
+    def __init__(self, project_qpm, site_qpm):
+        self.project_bucket = TokenBucket(project_qpm)
+        self.site_qpm = site_qpm
+        self.site_buckets = {}
+        self.lock = threading.Lock()
+    
+    def _site_bucket(self, site_url):
+        with self.lock:
+            bucket = self.site_buckets.get(site_url)
+            if bucket is None:
+                bucket = TokenBucket(self.site_qpm)
+                self.site_buckets[site_url] = bucket
+            return bucket
+    
+    def acquire(self, site_url=None):
+        """Önce site, sonra proje kotasından token al"""
+        if site_url:
+            self._site_bucket(site_url).acquire()
+        self.project_bucket.acquire()
+
+
+# Tüm oturumlar ve thread'ler aynı kotayı paylaşır
+search_console_limiter = RateLimiter(SEARCH_CONSOLE_PROJECT_QPM, SEARCH_CONSOLE_SITE_QPM)
+
+
+def is_retryable_error(error):
+    """429/5xx ve kota kaynaklı 403 hatalarını yeniden denenebilir say"""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status in RETRYABLE_STATUS_CODES:
+        return True
+    if status == 403:
+        reason = str(getattr(error, 'reason', '') or error).lower().replace(' ', '')
+        return any(retryable in reason for retryable in RETRYABLE_REASONS)
+    return False
+
+
+def call_with_backoff(func, limiter=None, site_url=None, max_retries=5, base_delay=1.0, max_delay=32.0):
+    """Çağrıyı hız sınırıyla yap, yeniden denenebilir hatalarda jitter'lı üstel bekleme uygula"""
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire(site_url)
+        try:
+            return func()
+        except HttpError as error:
+            if attempt >= max_retries or not is_retryable_error(error):
+                raise
+            # Full jitter: eşzamanlı oturumların aynı anda tekrar denemesini önler
+            time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
+            attempt += 1
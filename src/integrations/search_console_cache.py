@@ -0,0 +1,188 @@
+"""Search Console verileri için site ve gün bazlı kalıcı önbellek"""
+import json
+from datetime import datetime, timedelta
+import streamlit as st
+from googleapiclient.errors import HttpError
+from src.config import SEARCH_CONSOLE_FINALIZATION_DAYS
+from src.integrations.google_search_console import (
+    PARALLEL_WORKERS,
+    SEARCH_DIMENSIONS,
+    iter_shard_rows
+)
+from src.utils.local_store import connect_store
+
+STORE_NAMESPACE = 'search_console'
+KEY_SEPARATOR = '\x1f'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    dimensions TEXT NOT NULL,
+    day TEXT NOT NULL,
+    keys TEXT NOT NULL,
+    clicks INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    position REAL
+);
+CREATE INDEX IF NOT EXISTS rows_dimensions_day ON rows (dimensions, day);
+CREATE TABLE IF NOT EXISTS days (
+    dimensions TEXT NOT NULL,
+    day TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    final INTEGER NOT NULL,
+    PRIMARY KEY (dimensions, day)
+);
+"""
+
+
+def _dimension_key(dimensions, filters=None):
+    """Boyut kümesi ve API filtrelerini önbellek bölüm anahtarına çevir"""
+    key = ','.join(dimensions)
+    active_filters = {name: value for name, value in (filters or {}).items() if value}
+    if active_filters:
+        key += '|' + json.dumps(active_filters, sort_keys=True, ensure_ascii=False)
+    return key
+
+
+def _final_days(connection, dimension_key, start_date, end_date):
+    """Önbellekte kesinleşmiş olarak saklanan günleri döndür"""
+    cursor = connection.execute(
+        "SELECT day FROM days WHERE dimensions = ? AND day BETWEEN ? AND ? AND final = 1",
+        (dimension_key, start_date.isoformat(), end_date.isoformat())
+    )
+    return {row[0] for row in cursor}
+
+
+def get_missing_days(connection, dimension_key, start_date, end_date):
+    """Çekilmesi gereken günleri bul - eksik günler ve henüz kesinleşmemiş son günler"""
+    final_days = _final_days(connection, dimension_key, start_date, end_date)
+    missing = []
+    day = start_date
+    while day <= end_date:
+        if day.isoformat() not in final_days:
+            missing.append(day)
+        day += timedelta(days=1)
+    return missing
+
+
+def _store_day(connection, dimension_key, day, rows):
+    """Bir günün satırlarını önbelleğe yaz (o günün eski kaydının yerine)"""
+    today = datetime.now().date()
+    final = (today - day).days >= SEARCH_CONSOLE_FINALIZATION_DAYS
+    
+    with connection:
+        connection.execute(
+            "DELETE FROM rows WHERE dimensions = ? AND day = ?",
+            (dimension_key, day.isoformat())
+        )
+        connection.executemany(
+            "INSERT INTO rows (dimensions, day, keys, clicks, impressions, position) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    dimension_key,
+                    day.isoformat(),
+                    KEY_SEPARATOR.join(row.get('keys', [])),
+                    row.get('clicks', 0),
+                    row.get('impressions', 0),
+                    row.get('position')
+                )
+                for row in rows
+            )
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO days (dimensions, day, fetched_at, final) VALUES (?, ?, ?, ?)",
+            (dimension_key, day.isoformat(), datetime.now().isoformat(timespec='seconds'), int(final))
+        )
+
+
+def read_cached_rows(connection, dimension_key, start_date, end_date):
+    """Önbellekteki günlük satırları aralık için birleştir - pozisyon gösterim ağırlıklı"""
+    cursor = connection.execute(
+        """
+        SELECT
+            keys,
+            SUM(clicks),
+            SUM(impressions),
+            SUM(position * impressions),
+            SUM(CASE WHEN position IS NOT NULL THEN impressions END)
+        FROM rows
+        WHERE dimensions = ? AND day BETWEEN ? AND ?
+        GROUP BY keys
+        ORDER BY SUM(clicks) DESC
+        """,
+        (dimension_key, start_date.isoformat(), end_date.isoformat())
+    )
+    
+    rows = []
+    # Pozisyonu olmayan satırların gösterimleri paydaya katılmaz
+    for keys, clicks, impressions, weighted_position, position_impressions in cursor:
+        rows.append({
+            'keys': keys.split(KEY_SEPARATOR),
+            'clicks': clicks,
+            'impressions': impressions,
+            'ctr': clicks / impressions if impressions > 0 else 0,
+            'position': weighted_position / position_impressions if position_impressions else None
+        })
+    return rows
+
+
+def _sync_days(connection, service, site_url, dimension_key, start_date, end_date, max_workers, filters):
+    """Aralıktaki eksik ve kesinleşmemiş günleri API'den çekip önbelleğe yaz
+    
+    Dönüş: (önbelleğe yazılan gün sayısı, hata nedeniyle yazılamayan gün sayısı)
+    """
+    missing_days = get_missing_days(connection, dimension_key, start_date, end_date)
+    stored_days = 0
+    
+    try:
+        date_ranges = [(day, day) for day in missing_days]
+        for day, rows in iter_shard_rows(service, site_url, date_ranges, None, max_workers, filters):
+            _store_day(connection, dimension_key, day, rows)
+            stored_days += 1
+    except HttpError as error:
+        st.error(f"Veri çekilirken hata oluştu: {error}")
+    except Exception as error:
+        st.error(f"Beklenmeyen hata: {error}")
+    
+    return stored_days, len(missing_days) - stored_days
+
+
+def get_cached_search_analytics(service, site_url, start_date, end_date, max_workers=PARALLEL_WORKERS,
+                                filters=None):
+    """Analitik verileri önbellekten getir - sadece eksik ve kesinleşmemiş günler API'den çekilir
+    
+    Dönüş: (satırlar, API'den çekilen gün sayısı, çekilemeyen gün sayısı)
+    """
+    dimension_key = _dimension_key(SEARCH_DIMENSIONS, filters)
+    connection = connect_store(STORE_NAMESPACE, site_url, SCHEMA)
+    
+    try:
+        fetched_days, failed_days = _sync_days(
+            connection, service, site_url, dimension_key, start_date, end_date, max_workers, filters
+        )
+        return read_cached_rows(connection, dimension_key, start_date, end_date), fetched_days, failed_days
+    finally:
+        connection.close()
+
+
+def get_cached_period_rows(service, site_url, periods, max_workers=PARALLEL_WORKERS, filters=None):
+    """Birden fazla dönemi tek senkronizasyonla getir - eksik günler bir kez çekilir
+    
+    periods: [(başlangıç, bitiş), ...]
+    Dönüş: (dönem başına satır listeleri, API'den çekilen gün sayısı, çekilemeyen gün sayısı)
+    """
+    dimension_key = _dimension_key(SEARCH_DIMENSIONS, filters)
+    connection = connect_store(STORE_NAMESPACE, site_url, SCHEMA)
+    
+    try:
+        fetched_days, failed_days = _sync_days(
+            connection, service, site_url, dimension_key,
+            min(start for start, _ in periods), max(end for _, end in periods),
+            max_workers, filters
+        )
+        period_rows = [
+            read_cached_rows(connection, dimension_key, start, end)
+            for start, end in periods
+        ]
+        return period_rows, fetched_days, failed_days
+    finally:
+        connection.close()
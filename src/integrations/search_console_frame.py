@@ -0,0 +1,176 @@
+"""Search Console satırlarını sütun bazında DataFrame'e dönüştürme"""
+import sys
+from array import array
+import numpy as np
+import pandas as pd
+import streamlit as st
+from googleapiclient.errors import HttpError
+from src.utils.columnar import DictionaryColumn
+
+QUERY_COLUMN = 'Anahtar Kelime'
+PAGE_COLUMN = 'İlgili Sayfa'
+CLICKS_COLUMN = 'Tıklama'
+IMPRESSIONS_COLUMN = 'Gösterim'
+CTR_COLUMN = 'CTR'
+POSITION_COLUMN = 'Ortalama Pozisyon'
+
+
+class SearchAnalyticsFrameBuilder:
+    """Sayfa sayfa gelen API satırlarını tipli sütunlarda biriktir
+    
+    Ham satır listeleri saklanmaz; her sayfa eklendikten sonra atılabilir.
+    Sorgu ve sayfa sütunları category, tıklama/gösterim int32,
+    CTR/pozisyon float32 olarak üretilir. fetched_rows API'den alınan satır
+    sayısıdır ve yarıda kalan çekmeye devam ederken startRow olarak kullanılır.
+    Aşamalı gösterim için toplamlar satırlar eklenirken güncellenir (bkz. get_progress).
+    """
+    
+    def __init__(self):
+        self.fetched_rows = 0
+        self.fetched_pages = 0
+        self.error = None
+        self.total_clicks = 0
+        self.total_impressions = 0
+        self.position_sum = 0.0
+        self.position_count = 0
+        self.queries = DictionaryColumn()
+        self.pages = DictionaryColumn()
+        self.clicks = array('i')
+        self.impressions = array('i')
+        self.ctr = array('f')
+        self.position = array('f')
+    
+    def __len__(self):
+        return len(self.clicks)
+    
+    def append_rows(self, rows):
+        """Bir API sayfasındaki satırları sütunlara ekle"""
+        self.fetched_rows += len(rows)
+        self.fetched_pages += 1
+        for row in rows:
+            keys = row.get('keys', [])
+            if len(keys) < 2:
+                continue
+            
+            position = row.get('position')
+            clicks = int(row.get('clicks', 0))
+            impressions = int(row.get('impressions', 0))
+            self.queries.append(keys[0] if keys[0] else 'N/A')
+            self.pages.append(keys[1] if keys[1] else 'N/A')
+            self.clicks.append(clicks)
+            self.impressions.append(impressions)
+            self.ctr.append(row.get('ctr', 0) or 0.0)
+            self.total_clicks += clicks
+            self.total_impressions += impressions
+            if position is None:
+                self.position.append(float('nan'))
+            else:
+                self.position.append(position)
+                self.position_sum += position
+                self.position_count += 1
+    
+    def get_progress(self):
+        """Şu ana kadarki toplamlar - summarize_search_analytics ile aynı anahtarlar
+        
+        Sorgu ve sayfa sözlükleri zaten tutulduğu için benzersiz sayılar kesindir.
+        """
+        return {
+            'rows': len(self),
+            'pages': self.fetched_pages,
+            'clicks': self.total_clicks,
+            'impressions': self.total_impressions,
+            'ctr': self.total_clicks / self.total_impressions * 100 if self.total_impressions > 0 else 0,
+            'position': self.position_sum / self.position_count if self.position_count else None,
+            'distinct_queries': len(self.queries.values),
+            'distinct_pages': len(self.pages.values)
+        }
+    
+    def to_frame(self):
+        """Biriken sütunlardan tıklamaya göre sıralı DataFrame oluştur"""
+        df = pd.DataFrame({
+            QUERY_COLUMN: self.queries.to_categorical(),
+            PAGE_COLUMN: self.pages.to_categorical(),
+            CLICKS_COLUMN: np.array(self.clicks, dtype=np.int32),
+            IMPRESSIONS_COLUMN: np.array(self.impressions, dtype=np.int32),
+            CTR_COLUMN: np.array(self.ctr, dtype=np.float32),
+            POSITION_COLUMN: np.array(self.position, dtype=np.float32)
+        })
+        return df.sort_values(CLICKS_COLUMN, ascending=False, kind='stable')
+
+
+def build_search_analytics_frame(pages, builder=None, on_page=None):
+    """Sayfa iterable'ını tüketip DataFrame oluştur - hata olursa o ana kadarki veri döner
+    
+    Var olan bir builder verilirse satırlar onun üzerine eklenir; hata builder.error'a yazılır.
+    on_page verilirse her sayfa eklendikten sonra builder ile çağrılır (aşamalı gösterim).
+    """
+    if builder is None:
+        builder = SearchAnalyticsFrameBuilder()
+    builder.error = None
+    
+    try:
+        for rows in pages:
+            builder.append_rows(rows)
+            if on_page is not None:
+                on_page(builder)
+    except HttpError as error:
+        builder.error = str(error)
+        st.error(f"Veri çekilirken hata oluştu: {error}")
+    except Exception as error:
+        builder.error = str(error)
+        st.error(f"Beklenmeyen hata: {error}")
+    
+    return builder.to_frame()
+
+
+def summarize_search_analytics(df, row_ids=None):
+    """Özet metrikleri (isteğe bağlı satır alt kümesi üzerinde) NumPy ile hesapla"""
+    clicks = df[CLICKS_COLUMN].to_numpy()
+    impressions = df[IMPRESSIONS_COLUMN].to_numpy()
+    position = df[POSITION_COLUMN].to_numpy()
+    if row_ids is not None:
+        clicks = clicks[row_ids]
+        impressions = impressions[row_ids]
+        position = position[row_ids]
+    
+    total_clicks = int(clicks.sum(dtype=np.int64))
+    total_impressions = int(impressions.sum(dtype=np.int64))
+    valid_position = position[~np.isnan(position)]
+    
+    return {
+        'clicks': total_clicks,
+        'impressions': total_impressions,
+        'ctr': total_clicks / total_impressions * 100 if total_impressions > 0 else 0,
+        'position': float(valid_position.mean(dtype=np.float64)) if len(valid_position) else None
+    }
+
+
+def get_frame_memory_usage(df):
+    """Tipli çerçevenin bellek kullanımını önceki object/float64 yapısıyla karşılaştır
+    
+    Önceki yapı oluşturulmadan tahmin edilir: her satır için ayrı string
+    nesnesi ve 8 baytlık işaretçi, sayısal sütunlar için 8 bayt.
+    """
+    current = int(df.memory_usage(index=True, deep=True).sum())
+    row_count = len(df)
+    previous = int(df.index.memory_usage())
+    
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            sizes = np.fromiter(
+                (sys.getsizeof(value) for value in series.cat.categories),
+                dtype=np.int64,
+                count=len(series.cat.categories)
+            )
+            previous += int((counts * sizes).sum()) + 8 * row_count
+        else:
+            previous += 8 * row_count
+    
+    return {
+        'current': current,
+        'previous': previous,
+        'saved': previous - current
+    }
@@ -0,0 +1,105 @@
+"""Sayfalar arasında paylaşılan arayüz bileşenleri"""
+import math
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZE_OPTIONS = [50, 100, 250, 500]
+
+
+def _get_sort_keys(series):
+    """Sütunu artan sıralamaya uygun float anahtarlara çevir (boş değerler sona)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        ranks = np.empty(len(categories), dtype=np.float64)
+        ranks[np.argsort(categories.to_numpy(dtype=object).astype(str), kind='stable')] = np.arange(len(categories))
+        codes = series.cat.codes.to_numpy()
+        keys = np.where(codes >= 0, ranks[codes], np.nan)
+    elif pd.api.types.is_numeric_dtype(series.dtype):
+        keys = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        codes, _ = pd.factorize(series, sort=True)
+        keys = np.where(codes >= 0, codes, np.nan).astype(np.float64)
+    return keys
+
+
+def get_top_k_positions(series, k, ascending=True):
+    """Sıralamada ilk k satırın konumlarını kısmi seçim ile bul
+    
+    Eşit anahtarlı satırlar satır sırasıyla seçilip sıralanır; böylece sayfalar
+    bağımsız hesaplansa da sınırdaki satırlar tekrarlanmaz ya da atlanmaz.
+    """
+    keys = _get_sort_keys(series)
+    if not ascending:
+        keys = -keys
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    
+    if k >= len(keys):
+        candidates = np.arange(len(keys))
+    elif k > 0:
+        kth = np.partition(keys, k - 1)[k - 1]
+        smaller = np.flatnonzero(keys < kth)
+        tied = np.flatnonzero(keys == kth)[:k - len(smaller)]
+        candidates = np.concatenate((smaller, tied))
+    else:
+        candidates = np.empty(0, dtype=np.int64)
+    return candidates[np.lexsort((candidates, keys[candidates]))]
+
+
+def render_paged_dataframe(df, key, column_config=None, column_order=None,
+                           default_sort=None, default_ascending=False, transform=None):
+    """Büyük tabloları sunucu tarafında sıralayıp sadece görünen sayfayı gönder
+    
+    transform verilirse yalnızca seçilen sayfa dilimine uygulanır.
+    """
+    total_rows = len(df)
+    sortable_columns = list(df.columns)
+    
+    col_sort, col_direction, col_size, col_page = st.columns([3, 2, 2, 2])
+    
+    with col_sort:
+        sort_column = st.selectbox(
+            "Sırala:",
+            sortable_columns,
+            index=sortable_columns.index(default_sort) if default_sort in sortable_columns else 0,
+            key=f"{key}_sort"
+        )
+    with col_direction:
+        direction = st.radio(
+            "Yön:",
+            ["Azalan", "Artan"],
+            index=1 if default_ascending else 0,
+            horizontal=True,
+            key=f"{key}_direction"
+        )
+    with col_size:
+        page_size = st.selectbox("Satır/Sayfa:", PAGE_SIZE_OPTIONS, index=1, key=f"{key}_page_size")
+    
+    total_pages = max(1, math.ceil(total_rows / page_size))
+    page_key = f"{key}_page"
+    # Filtre değişip sayfa sayısı azaldıysa seçili sayfayı sınırla
+    if st.session_state.get(page_key, 1) > total_pages:
+        st.session_state[page_key] = total_pages
+    
+    with col_page:
+        page = st.number_input("Sayfa:", min_value=1, max_value=total_pages, step=1, key=page_key)
+    
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_rows)
+    if total_rows:
+        positions = get_top_k_positions(df[sort_column], end, ascending=direction == "Artan")[start:end]
+        page_df = df.iloc[positions]
+    else:
+        page_df = df
+    
+    if transform is not None:
+        page_df = transform(page_df)
+    
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        hide_index=True,
+        column_order=column_order,
+        column_config=column_config
+    )
+    st.caption(f"Toplam {total_rows:,} satır · Sayfa {page}/{total_pages} · {start + 1 if total_rows else 0}-{end} arası gösteriliyor")
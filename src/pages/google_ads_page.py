@@ -3,7 +3,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
 from src.config import (
     GOOGLE_ADS_DEVELOPER_TOKEN,
     GOOGLE_ADS_CUSTOMER_ID,
@@ -14,12 +13,144 @@ from src.config import (
 )
 from src.integrations.google_ads import (
     get_google_ads_client,
+    release_google_ads_client,
     get_google_ads_credentials,
     save_google_ads_credentials,
-    get_campaigns_data,
+    get_campaign_report,
+    get_all_customers_campaigns,
     list_customer_accounts,
     get_conversion_details
 )
+from src.integrations.google_ads_frame import rolling_mean
+from src.pages.components import render_paged_dataframe
+
+
+TREND_METRICS = ['Maliyet (₺)', 'Tıklama', 'Gösterim', 'Dönüşüm', 'CTR', 'Ortalama CPC (₺)']
+
+
+def _render_daily_trends(matrix):
+    """Önbellekteki kampanya x gün matrisinden günlük trend ve kayan ortalama grafiği"""
+    st.markdown("### 📈 Günlük Trendler")
+    
+    campaign_options = dict(zip(matrix.campaign_names, matrix.campaign_ids.tolist()))
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        selected_names = st.multiselect(
+            "Kampanyalar (boş = tümü):",
+            list(campaign_options.keys()),
+            key='google_ads_trend_campaigns'
+        )
+    with col2:
+        metric = st.selectbox("Metrik:", TREND_METRICS, key='google_ads_trend_metric')
+    with col3:
+        window = st.selectbox("Kayan ortalama:", [1, 7, 14, 28], index=1, key='google_ads_trend_window',
+                              format_func=lambda days: "Yok" if days == 1 else f"{days} gün")
+    
+    campaign_ids = [campaign_options[name] for name in selected_names] if selected_names else None
+    daily = matrix.get_daily_frame(campaign_ids)
+    chart = daily[[metric]]
+    if window > 1:
+        chart = chart.assign(**{f"{window} Günlük Ortalama": rolling_mean(daily[metric].to_numpy(), window)})
+    st.line_chart(chart)
+
+
+def _render_all_accounts_section(client, customer_accounts):
+    """Tüm müşteri hesaplarının kampanyalarını eşzamanlı çekip tek tabloda göster"""
+    st.subheader("🌐 Tüm Hesaplar")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        default_end = datetime.now().date()
+        start_date = st.date_input(
+            "Başlangıç Tarihi",
+            value=default_end - timedelta(days=30),
+            max_value=default_end,
+            key='google_ads_all_start_date'
+        )
+    with col2:
+        end_date = st.date_input(
+            "Bitiş Tarihi",
+            value=default_end,
+            max_value=default_end,
+            key='google_ads_all_end_date'
+        )
+    
+    if start_date > end_date:
+        st.error("⚠️ Başlangıç tarihi bitiş tarihinden sonra olamaz!")
+        return
+    
+    if st.button("📊 Tüm Hesapları Getir", type="primary", use_container_width=True, key="google_ads_all_fetch_btn"):
+        with st.spinner(f"{len(customer_accounts)} hesap eşzamanlı çekiliyor..."):
+            campaigns, errors = get_all_customers_campaigns(client, customer_accounts, start_date, end_date)
+        st.session_state['google_ads_all_accounts'] = {
+            'range': (start_date, end_date),
+            'data': campaigns,
+            'errors': errors
+        }
+    
+    result = st.session_state.get('google_ads_all_accounts')
+    if not result:
+        return
+    
+    for error in result['errors']:
+        st.error(f"❌ **{error['customer_id']} Hatası:** {error['error']}")
+    
+    if result['range'] != (start_date, end_date):
+        st.info("Tarih aralığı değişti, güncel veriler için hesapları tekrar getirin.")
+    
+    campaigns = result['data']
+    if campaigns.empty:
+        st.warning("⚠️ Seçilen tarih aralığında kampanya verisi bulunamadı.")
+        return
+    
+    # Hesap bazında özet - para birimleri farklı olabileceği için ayrı gösterilir
+    accounts = campaigns.groupby(['Customer ID', 'Hesap Adı', 'Para Birimi'], sort=False).agg({
+        'Maliyet (₺)': 'sum',
+        'Gösterim': 'sum',
+        'Tıklama': 'sum',
+        'Dönüşüm': 'sum',
+        'Kampanya ID': 'count'
+    }).reset_index().rename(columns={'Maliyet (₺)': 'Maliyet', 'Kampanya ID': 'Kampanya Sayısı'})
+    accounts = accounts.sort_values('Maliyet', ascending=False, ignore_index=True)
+    
+    st.markdown(f"### 🏢 Hesap Özeti ({len(accounts)} hesap)")
+    st.dataframe(
+        accounts,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Customer ID': st.column_config.TextColumn('Customer ID', width='small'),
+            'Hesap Adı': st.column_config.TextColumn('Hesap Adı', width='medium'),
+            'Para Birimi': st.column_config.TextColumn('Para Birimi', width='small'),
+            'Maliyet': st.column_config.NumberColumn('Maliyet', format='%.2f'),
+            'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+            'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+            'Dönüşüm': st.column_config.NumberColumn('Dönüşüm', format='%.1f'),
+            'Kampanya Sayısı': st.column_config.NumberColumn('Kampanya Sayısı', format='%d')
+        }
+    )
+    
+    st.markdown("### 📋 Tüm Kampanyalar")
+    render_paged_dataframe(
+        campaigns,
+        key='google_ads_all_campaigns_table',
+        default_sort='Maliyet (₺)',
+        column_config={
+            'Customer ID': st.column_config.TextColumn('Customer ID', width='small'),
+            'Hesap Adı': st.column_config.TextColumn('Hesap Adı', width='medium'),
+            'Para Birimi': st.column_config.TextColumn('Para Birimi', width='small'),
+            'Kampanya ID': st.column_config.NumberColumn('Kampanya ID', format='%d'),
+            'Kampanya Adı': st.column_config.TextColumn('Kampanya Adı', width='large'),
+            'Durum': st.column_config.TextColumn('Durum', width='small'),
+            'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+            'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+            'Maliyet (₺)': st.column_config.NumberColumn('Maliyet', format='%.2f'),
+            'Dönüşüm': st.column_config.NumberColumn('Dönüşüm', format='%.1f'),
+            'CTR': st.column_config.NumberColumn('CTR', format='%.2f%%'),
+            'Ortalama CPC (₺)': st.column_config.NumberColumn('Ortalama CPC', format='%.2f'),
+            'Dönüşüm Başına Maliyet (₺)': st.column_config.NumberColumn('Dönüşüm Başına Maliyet', format='%.2f')
+        }
+    )
 
 
 def get_google_ads_flow():
@@ -162,6 +293,7 @@ def render_google_ads():
         st.success("✅ Google Ads hesabınıza başarıyla bağlandınız!")
         
         if st.button("🔌 Bağlantıyı Kes", type="secondary"):
+            release_google_ads_client()
             if 'google_ads_credentials' in st.session_state:
                 del st.session_state['google_ads_credentials']
             if 'google_ads_connected' in st.session_state:
@@ -171,12 +303,7 @@ def render_google_ads():
         st.markdown("---")
         
         try:
-            # Token'ı yenile
-            if credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
-                save_google_ads_credentials(credentials)
-            
-            # Google Ads client'ı oluştur
+            # Havuzdaki client kullanılır - token arka planda yenilendiği için burada yenileme yapılmaz
             client = get_google_ads_client()
             
             if client:
@@ -246,6 +373,10 @@ def render_google_ads():
                         selected_customer_id = selected_customer_option.split(' - ')[0]
                         st.session_state['selected_customer_id'] = selected_customer_id
                         st.info(f"✅ Seçili hesap: **{selected_customer_option}**")
+                    
+                    if st.checkbox("🌐 Tüm Hesaplar Modu (tüm müşteri hesaplarını birlikte getir)", key='google_ads_all_accounts_mode'):
+                        st.markdown("---")
+                        _render_all_accounts_section(client, customer_accounts)
                 
                 else:
                     # Müşteri hesapları yüklenmemişse uyarı göster
@@ -298,19 +429,33 @@ def render_google_ads():
                         if start_date > end_date:
                             st.error("⚠️ Başlangıç tarihi bitiş tarihinden sonra olamaz!")
                         else:
-                            if st.button("📊 Verileri Getir", type="primary", use_container_width=True, key="google_ads_fetch_btn"):
+                            col_fetch, col_refresh = st.columns([3, 1])
+                            with col_fetch:
+                                fetch_clicked = st.button("📊 Verileri Getir", type="primary", use_container_width=True, key="google_ads_fetch_btn")
+                            with col_refresh:
+                                refresh_clicked = st.button(
+                                    "🔄 Yenile",
+                                    use_container_width=True,
+                                    key="google_ads_refresh_btn",
+                                    help="Son günleri önbelleği atlayarak API'den yeniden çeker"
+                                )
+                            
+                            if fetch_clicked or refresh_clicked:
                                 with st.spinner(f"Kampanya verileri çekiliyor (Hesap: {selected_customer_id}), lütfen bekleyin..."):
-                                    campaigns_data = get_campaigns_data(
+                                    # Veriler depodan/önbellekten gelir; sadece Yenile düzeltme penceresini hemen yeniden çeker
+                                    campaigns, _ = get_campaign_report(
                                         client,
                                         selected_customer_id,
                                         start_date,
-                                        end_date
+                                        end_date,
+                                        refresh=refresh_clicked
                                     )
                                     
-                                    if campaigns_data:
-                                        # Session state'e kaydet
-                                        st.session_state['google_ads_campaigns_data'] = campaigns_data
+                                    if campaigns is not None and not campaigns.empty:
+                                        # Session state'e kaydet - günlük matris önbellekte kalır
+                                        st.session_state['google_ads_campaigns_data'] = campaigns.to_dict('records')
                                         st.session_state['google_ads_selected_customer'] = selected_customer_id
+                                        st.session_state['google_ads_report_range'] = (start_date, end_date)
                                         st.rerun()
                                     else:
                                         st.warning("⚠️ Seçilen tarih aralığında kampanya verisi bulunamadı.")
@@ -323,6 +468,20 @@ def render_google_ads():
                                     if campaigns_data:
                                         df = pd.DataFrame(campaigns_data)
                                         
+                                        # Günlük matris önbellekten gelir, API tekrar çağrılmaz
+                                        report_start, report_end = st.session_state.get(
+                                            'google_ads_report_range', (start_date, end_date)
+                                        )
+                                        _, matrix = get_campaign_report(
+                                            client,
+                                            selected_customer_id,
+                                            report_start,
+                                            report_end
+                                        )
+                                        if matrix is not None:
+                                            sparklines = matrix.get_sparklines()
+                                            df['Günlük Maliyet'] = df['Kampanya ID'].map(sparklines)
+                                        
                                         # Toplamları hesapla
                                         total_spend = df['Maliyet (₺)'].sum()
                                         total_impressions = df['Gösterim'].sum()
@@ -348,10 +507,14 @@ def render_google_ads():
                                                 'Dönüşüm': st.column_config.NumberColumn('Dönüşüm', format='%d'),
                                                 'CTR': st.column_config.NumberColumn('CTR', format='%.2f%%'),
                                                 'Ortalama CPC (₺)': st.column_config.NumberColumn('Ortalama CPC (₺)', format='₺%.2f'),
-                                                'Dönüşüm Başına Maliyet (₺)': st.column_config.NumberColumn('Dönüşüm Başına Maliyet (₺)', format='₺%.2f')
+                                                'Dönüşüm Başına Maliyet (₺)': st.column_config.NumberColumn('Dönüşüm Başına Maliyet (₺)', format='₺%.2f'),
+                                                'Günlük Maliyet': st.column_config.LineChartColumn('Günlük Maliyet', width='medium')
                                             }
                                         )
                                         
+                                        if matrix is not None:
+                                            _render_daily_trends(matrix)
+                                        
                                         # Genel özet metrikleri
                                         st.markdown("### 📈 Genel Özet İstatistikler")
                                         col1, col2, col3, col4, col5, col6 = st.columns(6)
@@ -397,15 +560,15 @@ def render_google_ads():
                                             end_date
                                         )
                                         
-                                        if conversion_details:
+                                        if not conversion_details.empty:
                                             st.session_state['google_ads_conversion_details'] = conversion_details
                                             st.rerun()
                                         else:
                                             st.warning("⚠️ Seçilen tarih aralığında dönüşüm detayı bulunamadı.")
                                 
                                 # Dönüşüm detaylarını göster
-                                if 'google_ads_conversion_details' in st.session_state and st.session_state['google_ads_conversion_details']:
-                                    conversion_df = pd.DataFrame(st.session_state['google_ads_conversion_details'])
+                                if st.session_state.get('google_ads_conversion_details') is not None:
+                                    conversion_df = st.session_state['google_ads_conversion_details']
                                     
                                     if not conversion_df.empty:
                                         st.markdown("### 📋 Dönüşüm Detayları Tablosu")
@@ -425,18 +588,18 @@ def render_google_ads():
                                         else:
                                             filtered_df = conversion_df
                                         
-                                        # Tabloyu göster
-                                        st.dataframe(
+                                        # Tabloyu göster - sunucu tarafında sıralanıp sayfalanır
+                                        render_paged_dataframe(
                                             filtered_df,
-                                            use_container_width=True,
-                                            hide_index=True,
+                                            key='conversion_table',
+                                            default_sort='Dönüşüm Sayısı',
                                             column_config={
                                                 'Tarih': st.column_config.TextColumn('Tarih', width='small'),
                                                 'Keyword': st.column_config.TextColumn('Keyword', width='medium'),
                                                 'Eşleşme Türü': st.column_config.TextColumn('Eşleşme Türü', width='small'),
                                                 'Reklam Grubu': st.column_config.TextColumn('Reklam Grubu', width='medium'),
                                                 'Kampanya': st.column_config.TextColumn('Kampanya', width='medium'),
-                                                'Dönüşüm Sayısı': st.column_config.NumberColumn('Dönüşüm Sayısı', format='%d'),
+                                                'Dönüşüm Sayısı': st.column_config.NumberColumn('Dönüşüm Sayısı', format='%.2f'),
                                                 'Dönüşüm Değeri (₺)': st.column_config.NumberColumn('Dönüşüm Değeri (₺)', format='₺%.2f')
                                             }
                                         )
@@ -471,6 +634,7 @@ def render_google_ads():
             st.error(f"Bir hata oluştu: {e}")
             if "invalid_grant" in str(e).lower() or "token" in str(e).lower():
                 st.info("Token süresi dolmuş olabilir. Lütfen tekrar bağlanın.")
+                release_google_ads_client()
                 if 'google_ads_credentials' in st.session_state:
                     del st.session_state['google_ads_credentials']
                 st.rerun()
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 from src.config import META_ACCOUNT_IDS
 from src.integrations.meta_ads import get_all_meta_ads_data
+from src.pages.components import render_paged_dataframe
 
 
 def render_meta_ads():
@@ -48,98 +49,102 @@ def render_meta_ads():
                 if all_data:
                     df = pd.DataFrame(all_data)
                     
-                    # Toplamları hesapla
-                    total_spend = df['Harcama ($)'].sum()
-                    total_impressions = df['Gösterim'].sum()
-                    total_clicks = df['Tıklama'].sum()
-                    avg_cpm = df['CPM ($)'].mean()
-                    
-                    # Tabloyu göster
-                    st.markdown("### 📋 Detaylı Veriler")
-                    st.dataframe(
-                        df,
-                        use_container_width=True,
-                        hide_index=True,
-                        column_config={
-                            'Hesap ID': st.column_config.TextColumn('Hesap ID', width='small'),
-                            'Harcama ($)': st.column_config.NumberColumn(
-                                'Harcama ($)',
-                                format='$%.2f'
-                            ),
-                            'Gösterim': st.column_config.NumberColumn(
-                                'Gösterim',
-                                format='%d'
-                            ),
-                            'Tıklama': st.column_config.NumberColumn(
-                                'Tıklama',
-                                format='%d'
-                            ),
-                            'CPM ($)': st.column_config.NumberColumn(
-                                'CPM ($)',
-                                format='$%.2f'
-                            ),
-                            'Tarih Başlangıç': st.column_config.TextColumn('Tarih Başlangıç'),
-                            'Tarih Bitiş': st.column_config.TextColumn('Tarih Bitiş')
-                        }
-                    )
-                    
-                    # Hesap bazında özet
-                    st.markdown("### 📊 Hesap Bazında Özet")
-                    account_summary = df.groupby('Hesap ID').agg({
-                        'Harcama ($)': 'sum',
-                        'Gösterim': 'sum',
-                        'Tıklama': 'sum',
-                        'CPM ($)': 'mean'
-                    }).reset_index()
-                    
-                    account_summary.columns = ['Hesap ID', 'Toplam Harcama ($)', 'Toplam Gösterim', 'Toplam Tıklama', 'Ortalama CPM ($)']
-                    st.dataframe(
-                        account_summary,
-                        use_container_width=True,
-                        hide_index=True,
-                        column_config={
-                            'Toplam Harcama ($)': st.column_config.NumberColumn(
-                                'Toplam Harcama ($)',
-                                format='$%.2f'
-                            ),
-                            'Toplam Gösterim': st.column_config.NumberColumn(
-                                'Toplam Gösterim',
-                                format='%d'
-                            ),
-                            'Toplam Tıklama': st.column_config.NumberColumn(
-                                'Toplam Tıklama',
-                                format='%d'
-                            ),
-                            'Ortalama CPM ($)': st.column_config.NumberColumn(
-                                'Ortalama CPM ($)',
-                                format='$%.2f'
-                            )
-                        }
-                    )
-                    
-                    # Genel özet metrikleri
-                    st.markdown("### 📈 Genel Özet İstatistikler")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Toplam Harcama", f"${total_spend:,.2f}")
-                    
-                    with col2:
-                        st.metric("Toplam Gösterim", f"{total_impressions:,}")
-                    
-                    with col3:
-                        st.metric("Toplam Tıklama", f"{total_clicks:,}")
-                    
-                    with col4:
-                        st.metric("Ortalama CPM", f"${avg_cpm:,.2f}")
-                    
-                    # Session state'e kaydet (dashboard için)
-                    st.session_state['meta_ads_total_spend'] = total_spend
+                    # Session state'e kaydet (dashboard ve tablo sayfalaması için)
+                    st.session_state['meta_ads_total_spend'] = df['Harcama ($)'].sum()
                     st.session_state['meta_ads_data'] = df
                     
                     st.success(f"✅ {len(df)} kayıt başarıyla yüklendi!")
                 elif not errors:
                     st.warning("⚠️ Veri bulunamadı. Seçilen tarih aralığında veri olmayabilir.")
+        
+        # Veriler session state'ten gösterilir; tablo kontrolleri yeniden çalıştırmada kaybolmaz
+        if 'meta_ads_data' in st.session_state:
+            df = st.session_state['meta_ads_data']
+            
+            # Toplamları hesapla
+            total_spend = df['Harcama ($)'].sum()
+            total_impressions = df['Gösterim'].sum()
+            total_clicks = df['Tıklama'].sum()
+            avg_cpm = df['CPM ($)'].mean()
+            
+            # Tabloyu göster
+            st.markdown("### 📋 Detaylı Veriler")
+            render_paged_dataframe(
+                df,
+                key='meta_ads_table',
+                default_sort='Harcama ($)',
+                column_config={
+                    'Hesap ID': st.column_config.TextColumn('Hesap ID', width='small'),
+                    'Harcama ($)': st.column_config.NumberColumn(
+                        'Harcama ($)',
+                        format='$%.2f'
+                    ),
+                    'Gösterim': st.column_config.NumberColumn(
+                        'Gösterim',
+                        format='%d'
+                    ),
+                    'Tıklama': st.column_config.NumberColumn(
+                        'Tıklama',
+                        format='%d'
+                    ),
+                    'CPM ($)': st.column_config.NumberColumn(
+                        'CPM ($)',
+                        format='$%.2f'
+                    ),
+                    'Tarih Başlangıç': st.column_config.TextColumn('Tarih Başlangıç'),
+                    'Tarih Bitiş': st.column_config.TextColumn('Tarih Bitiş')
+                }
+            )
+            
+            # Hesap bazında özet
+            st.markdown("### 📊 Hesap Bazında Özet")
+            account_summary = df.groupby('Hesap ID').agg({
+                'Harcama ($)': 'sum',
+                'Gösterim': 'sum',
+                'Tıklama': 'sum',
+                'CPM ($)': 'mean'
+            }).reset_index()
+            
+            account_summary.columns = ['Hesap ID', 'Toplam Harcama ($)', 'Toplam Gösterim', 'Toplam Tıklama', 'Ortalama CPM ($)']
+            st.dataframe(
+                account_summary,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'Toplam Harcama ($)': st.column_config.NumberColumn(
+                        'Toplam Harcama ($)',
+                        format='$%.2f'
+                    ),
+                    'Toplam Gösterim': st.column_config.NumberColumn(
+                        'Toplam Gösterim',
+                        format='%d'
+                    ),
+                    'Toplam Tıklama': st.column_config.NumberColumn(
+                        'Toplam Tıklama',
+                        format='%d'
+                    ),
+                    'Ortalama CPM ($)': st.column_config.NumberColumn(
+                        'Ortalama CPM ($)',
+                        format='$%.2f'
+                    )
+                }
+            )
+            
+            # Genel özet metrikleri
+            st.markdown("### 📈 Genel Özet İstatistikler")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Toplam Harcama", f"${total_spend:,.2f}")
+            
+            with col2:
+                st.metric("Toplam Gösterim", f"{total_impressions:,}")
+            
+            with col3:
+                st.metric("Toplam Tıklama", f"{total_clicks:,}")
+            
+            with col4:
+                st.metric("Ortalama CPM", f"${avg_cpm:,.2f}")
     else:
         st.warning("⚠️ Lütfen Access Token girin.")
         st.info("""
@@ -1,4 +1,5 @@
 """SEO - Search Console sayfası"""
+import json
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
@@ -9,13 +10,378 @@ from src.integrations.google_search_console import (
     get_credentials,
     save_credentials,
     get_search_console_service,
+    get_credentials_cache_key,
     list_sites,
-    get_search_analytics
+    get_search_analytics,
+    iter_search_analytics,
+    get_portfolio_analytics
 )
-from src.utils.formatting import format_position, format_ctr
-from src.utils.date_utils import get_date_range
+from src.integrations.search_console_cache import get_cached_search_analytics, get_cached_period_rows
+from src.integrations.search_console_frame import (
+    SearchAnalyticsFrameBuilder,
+    build_search_analytics_frame,
+    get_frame_memory_usage,
+    summarize_search_analytics
+)
+from src.utils.search_index import FrameSearchIndex
+from src.utils.url_trie import UrlTrie
+from src.utils.period_compare import compare_periods, get_top_movers
+from src.utils.cannibalization import find_cannibalization, get_competing_pages
+from src.utils.formatting import get_position_buckets
+from src.pages.components import render_paged_dataframe
+from src.utils.date_utils import get_date_range, get_previous_period
 from src.config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, REDIRECT_URI, SCOPES
 
+PREVIEW_ROWS = 100
+
+
+def _render_portfolio_section(service, site_urls, start_date, end_date):
+    """Tüm mülklerin eşzamanlı çekilen özet tablosu"""
+    st.subheader("🗂️ Portföy Özeti")
+    
+    if st.button("📊 Tüm Mülkleri Getir", type="primary", use_container_width=True, key="seo_portfolio_fetch_btn"):
+        with st.spinner(f"{len(site_urls)} mülk eşzamanlı çekiliyor..."):
+            portfolio_data, errors = get_portfolio_analytics(service, site_urls, start_date, end_date)
+        
+        for error in errors:
+            st.error(f"❌ **{error['site_url']} Hatası:** {error['error']}")
+        
+        st.session_state['portfolio_data'] = portfolio_data
+        st.session_state['portfolio_range'] = (start_date, end_date)
+    
+    portfolio_data = st.session_state.get('portfolio_data')
+    if not portfolio_data:
+        return
+    
+    if st.session_state.get('portfolio_range') != (start_date, end_date):
+        st.info("Tarih aralığı değişti, güncel özet için mülkleri tekrar getirin.")
+    
+    df_portfolio = pd.DataFrame(portfolio_data)
+    df_portfolio['CTR'] = df_portfolio['CTR'] * 100
+    st.dataframe(
+        df_portfolio,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Mülk': st.column_config.TextColumn('Mülk', width='large'),
+            'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+            'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+            'CTR': st.column_config.NumberColumn('CTR', format='%.2f%%'),
+            'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f')
+        }
+    )
+    
+    col1, col2, col3 = st.columns(3)
+    total_clicks = int(df_portfolio['Tıklama'].sum())
+    total_impressions = int(df_portfolio['Gösterim'].sum())
+    with col1:
+        st.metric("Toplam Tıklama", f"{total_clicks:,}")
+    with col2:
+        st.metric("Toplam Gösterim", f"{total_impressions:,}")
+    with col3:
+        total_ctr = total_clicks / total_impressions * 100 if total_impressions > 0 else 0
+        st.metric("Ortalama CTR", f"{total_ctr:.2f}%")
+
+
+def _render_directory_view(df):
+    """URL dizin ağacından açılır dizin görünümü"""
+    with st.expander("📁 Dizin Görünümü"):
+        # Expander içeriği kapalıyken de çalışır; ağaç sadece istenince kurulur
+        if not st.checkbox("Dizin ağacını oluştur", key='directory_view_enabled'):
+            st.caption("URL'leri dizin bazında toplamak için işaretleyin.")
+            return
+        
+        # Ağaç veri seti başına bir kez kurulur, her önek toplamı O(derinlik) sürede okunur
+        url_trie = st.session_state.get('analytics_url_trie')
+        if url_trie is None or st.session_state.get('analytics_url_trie_source') is not df:
+            with st.spinner("Dizin ağacı hazırlanıyor..."):
+                url_trie = UrlTrie.from_frame(df)
+            st.session_state['analytics_url_trie'] = url_trie
+            st.session_state['analytics_url_trie_source'] = df
+            st.session_state['directory_path'] = []
+        
+        path = st.session_state.get('directory_path', [])
+        if url_trie.find(path) is None:
+            path = []
+        
+        st.markdown(f"**Konum:** `/{'/'.join(path)}`")
+        summary = url_trie.aggregate(path)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Tıklama", f"{summary['Tıklama']:,}")
+        with col2:
+            st.metric("Gösterim", f"{summary['Gösterim']:,}")
+        with col3:
+            st.metric("CTR", f"{summary['CTR']:.2f}%")
+        with col4:
+            position = summary['Ortalama Pozisyon']
+            st.metric("Ortalama Pozisyon", f"{position:.1f}" if position is not None else "N/A")
+        
+        children = url_trie.children(path)
+        if children:
+            st.dataframe(
+                pd.DataFrame(children),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'Dizin': st.column_config.TextColumn('Dizin', width='large'),
+                    'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+                    'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+                    'CTR': st.column_config.NumberColumn('CTR', format='%.2f%%'),
+                    'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f'),
+                    'Sayfa Sayısı': st.column_config.NumberColumn('Sayfa Sayısı', format='%d')
+                }
+            )
+        
+        col_down, col_up = st.columns([3, 1])
+        with col_down:
+            if children:
+                selected_child = st.selectbox(
+                    "Alt dizin:",
+                    [child['Dizin'] for child in children],
+                    key='directory_child_select'
+                )
+                if st.button("📂 Alt Dizine İn", key='directory_down_btn'):
+                    st.session_state['directory_path'] = path + [selected_child]
+                    st.rerun()
+        with col_up:
+            if path and st.button("⬆️ Üst Dizin", key='directory_up_btn'):
+                st.session_state['directory_path'] = path[:-1]
+                st.rerun()
+
+
+def _render_cannibalization_view(df):
+    """Aynı sorguda yarışan sayfaların (yamyamlık) analizi"""
+    with st.expander("⚔️ Anahtar Kelime Yamyamlığı"):
+        # Expander içeriği kapalıyken de çalışır; analiz sadece istenince hesaplanır
+        if not st.checkbox("Yamyamlık analizini hesapla", key='cannibalization_enabled'):
+            st.caption("Aynı sorguda yarışan sayfaları bulmak için işaretleyin.")
+            return
+        
+        min_page_impressions = st.number_input(
+            "Sayfa başına minimum gösterim:",
+            min_value=0,
+            value=10,
+            step=10,
+            key='cannibalization_min_impressions',
+            help="Bu değerin altında gösterim alan sayfalar yarışan sayfa sayılmaz."
+        )
+        
+        # Analiz veri seti ve eşik başına bir kez hesaplanır
+        cached = st.session_state.get('analytics_cannibalization')
+        if cached is None or cached['source'] is not df or cached['min_page_impressions'] != min_page_impressions:
+            with st.spinner("Yarışan sayfalar hesaplanıyor..."):
+                cached = {
+                    'source': df,
+                    'min_page_impressions': min_page_impressions,
+                    'data': find_cannibalization(df, min_page_impressions=min_page_impressions)
+                }
+            st.session_state['analytics_cannibalization'] = cached
+        
+        cannibalization = cached['data']
+        if cannibalization.empty:
+            st.info("Birden fazla sayfayla sıralanan sorgu bulunamadı.")
+            return
+        
+        st.caption(f"{len(cannibalization):,} sorgu birden fazla sayfayla sıralanıyor.")
+        render_paged_dataframe(
+            cannibalization,
+            key='cannibalization_table',
+            default_sort='Dağılan Tıklama',
+            transform=lambda page_df: page_df.assign(**{
+                'Lider Tıklama Payı': page_df['Lider Tıklama Payı'].to_numpy() * 100
+            }),
+            column_config={
+                'Anahtar Kelime': st.column_config.TextColumn('Anahtar Kelime', width='medium'),
+                'Sayfa Sayısı': st.column_config.NumberColumn('Sayfa Sayısı', format='%d'),
+                'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+                'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+                'Lider Sayfa': st.column_config.TextColumn('Lider Sayfa', width='large'),
+                'Lider Tıklama Payı': st.column_config.NumberColumn('Lider Tıklama Payı', format='%.1f%%'),
+                'Dağılan Tıklama': st.column_config.NumberColumn('Dağılan Tıklama', format='%d'),
+                'En İyi Pozisyon': st.column_config.NumberColumn('En İyi Pozisyon', format='%.1f'),
+                'En Kötü Pozisyon': st.column_config.NumberColumn('En Kötü Pozisyon', format='%.1f'),
+                'Pozisyon Aralığı': st.column_config.NumberColumn('Pozisyon Aralığı', format='%.1f'),
+                'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f')
+            }
+        )
+        
+        selected_query = st.selectbox(
+            "Yarışan sayfaları göster:",
+            cannibalization['Anahtar Kelime'].head(100).astype(str).tolist(),
+            key='cannibalization_query_select'
+        )
+        if selected_query:
+            competing = get_competing_pages(df, selected_query, min_page_impressions=min_page_impressions)
+            competing['Tıklama Payı'] = competing['Tıklama Payı'] * 100
+            competing['Gösterim Payı'] = competing['Gösterim Payı'] * 100
+            st.dataframe(
+                competing,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'İlgili Sayfa': st.column_config.TextColumn('İlgili Sayfa', width='large'),
+                    'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+                    'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
+                    'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f'),
+                    'Tıklama Payı': st.column_config.NumberColumn('Tıklama Payı', format='%.1f%%'),
+                    'Gösterim Payı': st.column_config.NumberColumn('Gösterim Payı', format='%.1f%%')
+                }
+            )
+
+
+def _render_period_comparison(service, site_url, start_date, end_date, filters):
+    """Seçili aralığı bir önceki eş uzunluktaki dönemle karşılaştır"""
+    st.markdown("---")
+    st.subheader("🔁 Önceki Dönemle Karşılaştırma")
+    
+    previous_start, previous_end = get_previous_period(start_date, end_date)
+    st.caption(
+        f"Önceki dönem: {previous_start.strftime('%d.%m.%Y')} - {previous_end.strftime('%d.%m.%Y')}"
+    )
+    comparison_key = (site_url, start_date, end_date, json.dumps(filters, sort_keys=True))
+    
+    if st.button("🔁 Dönemleri Karşılaştır", use_container_width=True, key="seo_compare_btn"):
+        with st.spinner("Dönemler karşılaştırılıyor..."):
+            # Her iki dönem tek senkronizasyonla önbellekten okunur, sadece eksik günler çekilir
+            (current_rows, previous_rows), fetched_days, failed_days = get_cached_period_rows(
+                service,
+                site_url,
+                [(start_date, end_date), (previous_start, previous_end)],
+                filters=filters
+            )
+            current_df = build_search_analytics_frame([current_rows])
+            previous_df = build_search_analytics_frame([previous_rows])
+            del current_rows, previous_rows
+            
+            st.session_state['period_comparison'] = {
+                'key': comparison_key,
+                'data': compare_periods(current_df, previous_df),
+                'current': summarize_search_analytics(current_df),
+                'previous': summarize_search_analytics(previous_df)
+            }
+        st.caption(f"💾 Önbellek kullanıldı, API'den {fetched_days} gün çekildi.")
+        if failed_days:
+            st.warning(f"⚠️ {failed_days} gün çekilemedi; karşılaştırma eksik veriyle yapıldı.")
+    
+    comparison = st.session_state.get('period_comparison')
+    if not comparison or comparison['key'] != comparison_key:
+        return
+    
+    current, previous = comparison['current'], comparison['previous']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Tıklama", f"{current['clicks']:,}", f"{current['clicks'] - previous['clicks']:+,}")
+    with col2:
+        st.metric("Gösterim", f"{current['impressions']:,}", f"{current['impressions'] - previous['impressions']:+,}")
+    with col3:
+        st.metric("CTR", f"{current['ctr']:.2f}%", f"{current['ctr'] - previous['ctr']:+.2f}%")
+    with col4:
+        if current['position'] is not None and previous['position'] is not None:
+            # Pozisyon numarasının azalması iyileşmedir
+            st.metric(
+                "Ortalama Pozisyon",
+                f"{current['position']:.1f}",
+                f"{current['position'] - previous['position']:+.1f}",
+                delta_color="inverse"
+            )
+        else:
+            st.metric("Ortalama Pozisyon", "N/A")
+    
+    column_config = {
+        'Anahtar Kelime': st.column_config.TextColumn('Anahtar Kelime', width='medium'),
+        'İlgili Sayfa': st.column_config.TextColumn('İlgili Sayfa', width='large'),
+        'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
+        'Önceki Tıklama': st.column_config.NumberColumn('Önceki Tıklama', format='%d'),
+        'Tıklama Değişimi': st.column_config.NumberColumn('Tıklama Değişimi', format='%+d'),
+        'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f'),
+        'Önceki Pozisyon': st.column_config.NumberColumn('Önceki Pozisyon', format='%.1f'),
+        'Pozisyon Değişimi': st.column_config.NumberColumn('Pozisyon Değişimi', format='%+.1f')
+    }
+    movers = {
+        "📈 Tıklama Kazananlar": ('Tıklama Değişimi', True),
+        "📉 Tıklama Kaybedenler": ('Tıklama Değişimi', False),
+        "⬆️ Pozisyon Yükselenler": ('Pozisyon Değişimi', True),
+        "⬇️ Pozisyon Düşenler": ('Pozisyon Değişimi', False)
+    }
+    
+    tabs = st.tabs(list(movers.keys()))
+    for tab, (column, largest) in zip(tabs, movers.values()):
+        with tab:
+            top_movers = get_top_movers(comparison['data'], column, n=20, largest=largest)
+            if top_movers.empty:
+                st.info("Bu kategoride değişim bulunamadı.")
+                continue
+            st.dataframe(
+                top_movers,
+                use_container_width=True,
+                hide_index=True,
+                column_order=list(column_config.keys()),
+                column_config=column_config
+            )
+
+
+def _stream_search_analytics(pages, builder):
+    """Sayfaları builder'a eklerken toplamları canlı göster - ilk sayfa hemen önizlenir
+    
+    Durdur düğmesi script'i yeniden çalıştırır; builder session_state'te tutulduğu
+    için o ana kadar alınan satırlar bir sonraki çalıştırmada korunur.
+    """
+    status = st.empty()
+    preview = st.empty()
+    first_page = builder.fetched_pages + 1
+    
+    def _render_progress(current):
+        progress = current.get_progress()
+        with status.container():
+            st.caption(f"⏳ {progress['pages']} sayfa, {progress['rows']:,} satır alındı...")
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("Tıklama", f"{progress['clicks']:,}")
+            with col2:
+                st.metric("Gösterim", f"{progress['impressions']:,}")
+            with col3:
+                st.metric("Ortalama CTR", f"{progress['ctr']:.2f}%")
+            with col4:
+                st.metric("Benzersiz Sorgu", f"{progress['distinct_queries']:,}")
+            with col5:
+                st.metric("Benzersiz Sayfa", f"{progress['distinct_pages']:,}")
+        
+        if current.fetched_pages == first_page:
+            preview.dataframe(
+                current.to_frame().head(PREVIEW_ROWS),
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    st.button("⏹️ Durdur (alınan veriyi koru)", key="seo_cancel_btn")
+    df = build_search_analytics_frame(pages, builder, on_page=_render_progress)
+    status.empty()
+    preview.empty()
+    return df
+
+
+def _finalize_interrupted_stream(stream, fetch_key):
+    """Yarıda kesilen aşamalı çekmenin satırlarını yükle ve devam etmeyi mümkün kıl
+    
+    Kesinti site, tarih ya da filtre değişikliğinden geldiyse kısmi veri mevcut
+    veri olarak gösterilmez; sadece devam adayı olarak saklanır.
+    """
+    builder = stream['builder']
+    st.session_state['analytics_resume'] = {
+        'key': stream['key'],
+        'builder': builder
+    }
+    if stream['key'] != fetch_key:
+        return
+    
+    df = builder.to_frame()
+    if not df.empty:
+        st.session_state['analytics_data'] = df
+        st.session_state['data_loaded'] = True
+        st.session_state['analytics_filters'] = stream['filters']
+    st.info(f"⏹️ Çekme durduruldu: {builder.fetched_rows:,} satır korundu.")
+
 
 def render_seo_search_console():
     """SEO - Search Console sayfası"""
@@ -124,8 +490,9 @@ def render_seo_search_console():
                 credentials.refresh(Request())
                 save_credentials(credentials)
 
+            # Servis ve site listesi önbellekten gelir; etkileşimler ağ çağrısı yapmaz
             service = get_search_console_service(credentials)
-            sites = list_sites(service)
+            sites = list_sites(service, cache_key=get_credentials_cache_key(credentials))
 
             if sites:
                 st.subheader("📊 Search Console Analitikleri")
@@ -166,6 +533,15 @@ def render_seo_search_console():
                     if selected_site != st.session_state['previous_site']:
                         if 'analytics_data' in st.session_state:
                             del st.session_state['analytics_data']
+                        if 'analytics_search_index' in st.session_state:
+                            del st.session_state['analytics_search_index']
+                        if 'analytics_url_trie' in st.session_state:
+                            del st.session_state['analytics_url_trie']
+                            del st.session_state['analytics_url_trie_source']
+                        st.session_state.pop('period_comparison', None)
+                        st.session_state.pop('analytics_cannibalization', None)
+                        st.session_state.pop('analytics_stream', None)
+                        st.session_state.pop('analytics_filters', None)
                         if 'data_loaded' in st.session_state:
                             st.session_state['data_loaded'] = False
                 
@@ -241,49 +617,153 @@ def render_seo_search_console():
                     else:
                         st.markdown("---")
                         
-                        if st.button("📊 Verileri Getir", type="primary", use_container_width=True):
+                        if st.checkbox("🗂️ Portföy Modu (tüm mülkleri birlikte getir)", key='seo_portfolio_mode'):
+                            _render_portfolio_section(service, site_urls, start_date, end_date)
+                            st.markdown("---")
+                        
+                        # Uzun aralıklarda tarih dilimleri eşzamanlı çekilip birleştirilir
+                        # Önbellekli mod kesinleşmiş günleri diskten okur, sadece eksik/son günleri çeker
+                        fetch_modes = {
+                            "Önbellekli": 'cache',
+                            "Standart": None,
+                            "Günlük Dilimler": 'day',
+                            "Haftalık Dilimler": 'week'
+                        }
+                        fetch_mode = st.radio(
+                            "⚙️ Çekme Modu:",
+                            list(fetch_modes.keys()),
+                            horizontal=True,
+                            key='seo_fetch_mode',
+                            help="Dilimli modlar uzun tarih aralıklarında istek başına satır sınırına takılmadan daha hızlı çeker."
+                        )
+                        
+                        # Çekmeden önce belirlenen filtreler API'ye gönderilir; arama kutusu yüklü veriyi daraltır
+                        with st.expander("🎯 API Filtreleri (çekmeden önce)"):
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                page_contains = st.text_input("Sayfa içerir:", key='seo_filter_page_contains', placeholder="/blog/")
+                                query_contains = st.text_input("Sorgu içerir:", key='seo_filter_query_contains')
+                                country = st.text_input("Ülke (ISO-3, örn. tur):", key='seo_filter_country', max_chars=3)
+                            with col2:
+                                page_regex = st.text_input("Sayfa regex:", key='seo_filter_page_regex', placeholder="^https://.*/urun/")
+                                query_not_contains = st.text_input("Sorgu içermez:", key='seo_filter_query_not_contains')
+                                device = st.selectbox("Cihaz:", ["Tümü", "DESKTOP", "MOBILE", "TABLET"], key='seo_filter_device')
+                        
+                        api_filters = {
+                            name: value for name, value in {
+                                'page_contains': page_contains,
+                                'page_regex': page_regex,
+                                'query_contains': query_contains,
+                                'query_not_contains': query_not_contains,
+                                'country': country,
+                                'device': device if device != "Tümü" else None
+                            }.items() if value
+                        }
+                        fetch_key = (selected_site, start_date, end_date, json.dumps(api_filters, sort_keys=True))
+                        
+                        fetch_clicked = st.button("📊 Verileri Getir", type="primary", use_container_width=True)
+                        
+                        # Durdur düğmesi ya da başka bir etkileşim aşamalı çekmeyi keser;
+                        # o ana kadar alınan satırlar kaybolmaz
+                        stream = st.session_state.pop('analytics_stream', None)
+                        if stream and not fetch_clicked:
+                            _finalize_interrupted_stream(stream, fetch_key)
+                        
+                        # Yarıda kalan standart çekmeye son başarılı startRow'dan devam edilebilir
+                        resume = st.session_state.get('analytics_resume')
+                        if resume and resume['key'] != fetch_key:
+                            resume = None
+                        
+                        resume_clicked = False
+                        if resume:
+                            st.warning(f"⚠️ Son çekme yarıda kaldı: {resume['builder'].fetched_rows:,} satır alındı.")
+                            resume_clicked = st.button("⏯️ Kaldığı Yerden Devam Et", use_container_width=True, key="seo_resume_btn")
+                        
+                        if fetch_clicked or resume_clicked:
                             with st.spinner("Veriler çekiliyor, lütfen bekleyin..."):
-                                rows = get_search_analytics(
-                                    service, 
-                                    selected_site, 
-                                    start_date, 
-                                    end_date,
-                                    row_limit=None
-                                )
+                                builder = None
+                                if resume_clicked or not fetch_modes[fetch_mode]:
+                                    # Sayfalar geldikçe sütunlara eklenir ve toplamlar canlı gösterilir,
+                                    # ham satırlar bellekte birikmez
+                                    builder = resume['builder'] if resume_clicked else SearchAnalyticsFrameBuilder()
+                                    st.session_state['analytics_stream'] = {
+                                        'key': fetch_key,
+                                        'builder': builder,
+                                        'filters': api_filters
+                                    }
+                                    df = _stream_search_analytics(iter_search_analytics(
+                                        service,
+                                        selected_site,
+                                        start_date,
+                                        end_date,
+                                        parallel=True,
+                                        start_row=builder.fetched_rows,
+                                        filters=api_filters
+                                    ), builder)
+                                    st.session_state.pop('analytics_stream', None)
+                                elif fetch_modes[fetch_mode] == 'cache':
+                                    rows, fetched_days, failed_days = get_cached_search_analytics(
+                                        service,
+                                        selected_site,
+                                        start_date,
+                                        end_date,
+                                        filters=api_filters
+                                    )
+                                    st.caption(f"💾 Önbellek kullanıldı, API'den {fetched_days} gün çekildi.")
+                                    if failed_days:
+                                        st.warning(f"⚠️ {failed_days} gün çekilemedi; sonuçlar eksik olabilir.")
+                                    df = build_search_analytics_frame([rows])
+                                    del rows
+                                else:
+                                    rows = get_search_analytics(
+                                        service,
+                                        selected_site,
+                                        start_date,
+                                        end_date,
+                                        row_limit=None,
+                                        parallel=True,
+                                        shard=fetch_modes[fetch_mode],
+                                        filters=api_filters
+                                    )
+                                    df = build_search_analytics_frame([rows])
+                                    del rows
                                 
-                                if rows:
-                                    data = []
-                                    for row in rows:
-                                        keys = row.get('keys', [])
-                                        if len(keys) >= 2:
-                                            data.append({
-                                                'Anahtar Kelime': keys[0] if keys[0] else 'N/A',
-                                                'İlgili Sayfa': keys[1] if keys[1] else 'N/A',
-                                                'Tıklama': row.get('clicks', 0),
-                                                'Gösterim': row.get('impressions', 0),
-                                                'CTR': row.get('ctr', 0),
-                                                'Ortalama Pozisyon': row.get('position', None)
-                                            })
-                                    
-                                    if data:
-                                        df = pd.DataFrame(data)
-                                        df = df.sort_values('Tıklama', ascending=False)
-                                        st.session_state['analytics_data'] = df
-                                        st.session_state['data_loaded'] = True
-                                        st.success(f"✅ {len(df)} kayıt başarıyla yüklendi!")
-                                    else:
-                                        st.warning("Veri bulunamadı.")
-                                        st.session_state['data_loaded'] = False
+                                if builder is not None and builder.error:
+                                    st.session_state['analytics_resume'] = {
+                                        'key': fetch_key,
+                                        'builder': builder
+                                    }
+                                    st.warning(
+                                        f"⚠️ Sonuç eksik: {builder.fetched_rows:,} satır alındı. "
+                                        "Kaldığı yerden devam edebilirsiniz."
+                                    )
+                                else:
+                                    st.session_state.pop('analytics_resume', None)
+                                
+                                if not df.empty:
+                                    st.session_state['analytics_data'] = df
+                                    st.session_state['data_loaded'] = True
+                                    st.session_state['analytics_filters'] = api_filters
+                                    st.success(f"✅ {len(df)} kayıt başarıyla yüklendi!")
+                                    memory = get_frame_memory_usage(df)
+                                    st.caption(
+                                        f"🧠 Bellek: {memory['current'] / 1024 / 1024:.1f} MB "
+                                        f"(önceki yapıya göre {memory['saved'] / 1024 / 1024:.1f} MB tasarruf)"
+                                    )
                                 else:
                                     st.warning("Seçilen tarih aralığında veri bulunamadı.")
                                     st.session_state['data_loaded'] = False
                         
                         if st.session_state.get('data_loaded', False) and 'analytics_data' in st.session_state:
-                            df = st.session_state['analytics_data'].copy()
+                            df = st.session_state['analytics_data']
                             
                             st.markdown("---")
                             st.subheader("📈 Detaylı Analitik Veriler")
                             
+                            if st.session_state.get('analytics_filters'):
+                                applied = ", ".join(f"{name}={value}" for name, value in st.session_state['analytics_filters'].items())
+                                st.caption(f"🎯 API filtreleri uygulandı: {applied}")
+                            
                             search_term = st.text_input(
                                 "🔍 Arama (Anahtar Kelime veya Sayfa):",
                                 key='search_input',
@@ -291,50 +771,68 @@ def render_seo_search_console():
                             )
                             
                             if search_term:
-                                mask = (
-                                    df['Anahtar Kelime'].str.contains(search_term, case=False, na=False) |
-                                    df['İlgili Sayfa'].str.contains(search_term, case=False, na=False)
-                                )
-                                df_filtered = df[mask]
+                                # Trigram indeksi veri seti başına bir kez kurulur, aramalar satır ID'lerine çözülür
+                                search_index = st.session_state.get('analytics_search_index')
+                                if search_index is None or search_index.df is not df:
+                                    with st.spinner("Arama indeksi hazırlanıyor..."):
+                                        search_index = FrameSearchIndex(df, ['Anahtar Kelime', 'İlgili Sayfa'])
+                                    st.session_state['analytics_search_index'] = search_index
+                                row_ids = search_index.search(search_term)
+                                df_filtered = df.iloc[row_ids]
                             else:
+                                row_ids = None
                                 df_filtered = df
                             
                             if not df_filtered.empty:
-                                df_display = df_filtered.copy()
-                                df_display['Ortalama Pozisyon'] = df_display['Ortalama Pozisyon'].apply(format_position)
-                                df_display['CTR'] = df_display['CTR'].apply(format_ctr)
-                                df_display['Tıklama'] = df_display['Tıklama'].astype(int)
-                                df_display['Gösterim'] = df_display['Gösterim'].astype(int)
+                                # Sayısal sütunlar korunur (sıralama bozulmaz), biçimlendirme column_config'e bırakılır.
+                                # Sıralama sunucu tarafında yapılır, sadece görünen sayfa biçimlendirilip gönderilir.
+                                def _prepare_display(page_df):
+                                    return page_df.assign(**{
+                                        'Durum': get_position_buckets(page_df['Ortalama Pozisyon'].to_numpy()),
+                                        'CTR': page_df['CTR'].to_numpy() * 100
+                                    })
                                 
-                                st.dataframe(
-                                    df_display,
-                                    use_container_width=True,
-                                    hide_index=True,
+                                render_paged_dataframe(
+                                    df_filtered,
+                                    key='seo_table',
+                                    default_sort='Tıklama',
+                                    transform=_prepare_display,
+                                    column_order=[
+                                        'Anahtar Kelime', 'İlgili Sayfa', 'Tıklama', 'Gösterim',
+                                        'CTR', 'Durum', 'Ortalama Pozisyon'
+                                    ],
                                     column_config={
                                         'Anahtar Kelime': st.column_config.TextColumn('Anahtar Kelime', width='medium'),
                                         'İlgili Sayfa': st.column_config.TextColumn('İlgili Sayfa', width='large'),
                                         'Tıklama': st.column_config.NumberColumn('Tıklama', format='%d'),
                                         'Gösterim': st.column_config.NumberColumn('Gösterim', format='%d'),
-                                        'CTR': st.column_config.TextColumn('CTR'),
-                                        'Ortalama Pozisyon': st.column_config.TextColumn('Ortalama Pozisyon')
+                                        'CTR': st.column_config.NumberColumn('CTR', format='%.2f%%'),
+                                        'Durum': st.column_config.TextColumn('Durum', width='small'),
+                                        'Ortalama Pozisyon': st.column_config.NumberColumn('Ortalama Pozisyon', format='%.1f')
                                     }
                                 )
                                 
                                 st.markdown("### 📊 Özet İstatistikler")
                                 col1, col2, col3, col4 = st.columns(4)
                                 
+                                summary = summarize_search_analytics(df, row_ids)
+                                
                                 with col1:
-                                    st.metric("Toplam Tıklama", f"{df_filtered['Tıklama'].sum():,}")
+                                    st.metric("Toplam Tıklama", f"{summary['clicks']:,}")
                                 with col2:
-                                    st.metric("Toplam Gösterim", f"{df_filtered['Gösterim'].sum():,}")
+                                    st.metric("Toplam Gösterim", f"{summary['impressions']:,}")
                                 with col3:
-                                    total_ctr = (df_filtered['Tıklama'].sum() / df_filtered['Gösterim'].sum() * 100) if df_filtered['Gösterim'].sum() > 0 else 0
-                                    st.metric("Ortalama CTR", f"{total_ctr:.2f}%")
+                                    st.metric("Ortalama CTR", f"{summary['ctr']:.2f}%")
                                 with col4:
-                                    avg_pos = df_filtered['Ortalama Pozisyon'].mean()
-                                    st.metric("Ortalama Pozisyon", f"{avg_pos:.1f}" if not pd.isna(avg_pos) else "N/A")
+                                    avg_pos = summary['position']
+                                    st.metric("Ortalama Pozisyon", f"{avg_pos:.1f}" if avg_pos is not None else "N/A")
                             else:
                                 st.info("Arama kriterinize uygun sonuç bulunamadı.")
+                            
+                            _render_directory_view(df)
+                            _render_cannibalization_view(df)
+                        
+                        _render_period_comparison(service, selected_site, start_date, end_date, api_filters)
             else:
                 st.warning("Search Console'da henüz mülk bulunmuyor.")
         except Exception as e:
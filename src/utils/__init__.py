@@ -1,9 +1,29 @@
 """Yardımcı fonksiyonlar modülü"""
-from .formatting import format_position, format_ctr
-from .date_utils import get_date_range
+from .formatting import format_position, format_ctr, get_position_buckets
+from .date_utils import get_date_range, split_date_range, get_previous_period
+from .search_index import TrigramIndex, FrameSearchIndex, turkish_casefold
+from .url_trie import UrlTrie, split_url_path
+from .period_compare import compare_periods, get_top_movers
+from .columnar import DictionaryColumn
+from .cannibalization import find_cannibalization, get_competing_pages
+from .cache_keys import get_credentials_cache_key
 
 __all__ = [
     'format_position',
     'format_ctr',
-    'get_date_range'
+    'get_position_buckets',
+    'get_date_range',
+    'split_date_range',
+    'get_previous_period',
+    'TrigramIndex',
+    'FrameSearchIndex',
+    'turkish_casefold',
+    'UrlTrie',
+    'split_url_path',
+    'compare_periods',
+    'get_top_movers',
+    'DictionaryColumn',
+    'find_cannibalization',
+    'get_competing_pages',
+    'get_credentials_cache_key'
 ]
@@ -0,0 +1,8 @@
+"""Önbellek anahtarı yardımcıları"""
+import hashlib
+
+
+def get_credentials_cache_key(credentials):
+    """Credentials için önbellek anahtarı üret (token değerleri açıkça saklanmaz)"""
+    secret = credentials.refresh_token or credentials.token or ''
+    return hashlib.sha256(f"{credentials.client_id}:{secret}".encode('utf-8')).hexdigest()
@@ -0,0 +1,115 @@
+"""Anahtar kelime yamyamlığı (aynı sorguda birden fazla URL) tespiti"""
+import numpy as np
+import pandas as pd
+
+QUERY_COLUMN = 'Anahtar Kelime'
+PAGE_COLUMN = 'İlgili Sayfa'
+
+
+def _group_bounds(sorted_codes):
+    """Sıralı kod dizisinde her grubun başlangıç indeksleri"""
+    starts = np.flatnonzero(np.diff(sorted_codes)) + 1
+    return np.concatenate(([0], starts)) if len(sorted_codes) else starts
+
+
+def find_cannibalization(df, min_pages=2, min_page_impressions=0):
+    """Birden fazla sayfayla sıralanan sorguları kategori kodları üzerinde gruplayarak bul
+    
+    Dönüş: sorgu başına sayfa sayısı, lider sayfa, tıklama payı ve pozisyon dağılımı;
+    lider dışı sayfalara dağılan tıklamaya göre sıralı
+    """
+    queries = df[QUERY_COLUMN]
+    if not isinstance(queries.dtype, pd.CategoricalDtype):
+        queries = queries.astype('category')
+    pages = df[PAGE_COLUMN]
+    if not isinstance(pages.dtype, pd.CategoricalDtype):
+        pages = pages.astype('category')
+    
+    codes = queries.cat.codes.to_numpy().astype(np.int64)
+    clicks = df['Tıklama'].to_numpy().astype(np.int64)
+    impressions = df['Gösterim'].to_numpy().astype(np.int64)
+    positions = df['Ortalama Pozisyon'].to_numpy().astype(np.float64)
+    
+    # Gürültü sayfaları elenir, ardından sadece birden fazla sayfalı sorgular tutulur
+    mask = (codes >= 0) & (impressions >= min_page_impressions)
+    page_counts = np.bincount(codes[mask], minlength=len(queries.cat.categories))
+    mask &= page_counts[np.where(codes >= 0, codes, 0)] >= min_pages
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return pd.DataFrame(columns=[
+            QUERY_COLUMN, 'Sayfa Sayısı', 'Tıklama', 'Gösterim', 'Lider Sayfa',
+            'Lider Tıklama Payı', 'Dağılan Tıklama', 'En İyi Pozisyon',
+            'En Kötü Pozisyon', 'Pozisyon Aralığı', 'Ortalama Pozisyon'
+        ])
+    
+    # Sorgu içinde en çok tıklanan (eşitlikte en iyi pozisyondaki) sayfa ilk sıraya gelir
+    order = rows[np.lexsort((positions[rows], -clicks[rows], codes[rows]))]
+    sorted_codes = codes[order]
+    starts = _group_bounds(sorted_codes)
+    group_codes = sorted_codes[starts]
+    
+    sorted_clicks = clicks[order]
+    sorted_impressions = impressions[order]
+    sorted_positions = positions[order]
+    
+    total_clicks = np.add.reduceat(sorted_clicks, starts)
+    total_impressions = np.add.reduceat(sorted_impressions, starts)
+    leader_clicks = sorted_clicks[starts]
+    
+    # Pozisyonu olmayan (NaN) sayfalar pozisyon istatistiklerine katılmaz; fmin/fmax NaN'ı atlar
+    has_position = ~np.isnan(sorted_positions)
+    weighted_positions = np.add.reduceat(
+        np.where(has_position, sorted_positions * sorted_impressions, 0.0), starts
+    )
+    position_impressions = np.add.reduceat(np.where(has_position, sorted_impressions, 0), starts)
+    best_positions = np.fmin.reduceat(sorted_positions, starts)
+    worst_positions = np.fmax.reduceat(sorted_positions, starts)
+    
+    leader_share = np.divide(
+        leader_clicks, total_clicks,
+        out=np.zeros(len(starts), dtype=np.float64),
+        where=total_clicks > 0
+    )
+    average_positions = np.divide(
+        weighted_positions, position_impressions,
+        out=np.full(len(starts), np.nan),
+        where=position_impressions > 0
+    )
+    
+    result = pd.DataFrame({
+        QUERY_COLUMN: pd.Categorical.from_codes(group_codes, categories=queries.cat.categories),
+        'Sayfa Sayısı': np.diff(np.append(starts, len(order))).astype(np.int32),
+        'Tıklama': total_clicks,
+        'Gösterim': total_impressions,
+        'Lider Sayfa': pages.iloc[order[starts]].to_numpy(),
+        'Lider Tıklama Payı': leader_share.astype(np.float32),
+        'Dağılan Tıklama': total_clicks - leader_clicks,
+        'En İyi Pozisyon': best_positions.astype(np.float32),
+        'En Kötü Pozisyon': worst_positions.astype(np.float32),
+        'Pozisyon Aralığı': (worst_positions - best_positions).astype(np.float32),
+        'Ortalama Pozisyon': average_positions.astype(np.float32)
+    })
+    return result.sort_values(['Dağılan Tıklama', 'Gösterim'], ascending=False, ignore_index=True)
+
+
+def get_competing_pages(df, query, min_page_impressions=0):
+    """Bir sorgu için yarışan sayfalar ve tıklama/gösterim payları
+    
+    min_page_impressions find_cannibalization ile aynı verilmeli - elenen sayfalar listelenmez.
+    """
+    queries = df[QUERY_COLUMN]
+    if isinstance(queries.dtype, pd.CategoricalDtype):
+        code = queries.cat.categories.get_indexer([query])[0]
+        rows = np.flatnonzero(queries.cat.codes.to_numpy() == code) if code >= 0 else np.array([], dtype=np.int64)
+    else:
+        rows = np.flatnonzero(queries.to_numpy() == query)
+    rows = rows[df['Gösterim'].to_numpy()[rows] >= min_page_impressions]
+    
+    competing = df.iloc[rows][[PAGE_COLUMN, 'Tıklama', 'Gösterim', 'Ortalama Pozisyon']]
+    total_clicks = competing['Tıklama'].sum()
+    total_impressions = competing['Gösterim'].sum()
+    competing = competing.assign(**{
+        'Tıklama Payı': competing['Tıklama'] / total_clicks if total_clicks > 0 else 0.0,
+        'Gösterim Payı': competing['Gösterim'] / total_impressions if total_impressions > 0 else 0.0
+    })
+    return competing.sort_values(['Tıklama', 'Ortalama Pozisyon'], ascending=[False, True], ignore_index=True)
@@ -0,0 +1,32 @@
+"""Sütun bazlı veri biriktirme yardımcıları"""
+from array import array
+import numpy as np
+import pandas as pd
+
+
+class DictionaryColumn:
+    """Tekrarlayan metinleri sözlük kodlamasıyla (değer -> int32 kod) sakla"""
+    
+    def __init__(self):
+        self.index = {}
+        self.values = []
+        self.codes = array('i')
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def encode(self, value):
+        """Değerin kodunu döndür, yeni değerse sözlüğe ekle"""
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+    
+    def append(self, value):
+        self.codes.append(self.encode(value))
+    
+    def to_categorical(self):
+        codes = np.frombuffer(self.codes, dtype=np.int32) if self.codes else np.empty(0, dtype=np.int32)
+        return pd.Categorical.from_codes(codes, categories=pd.Index(self.values, dtype=object))
@@ -40,3 +40,24 @@ def get_date_range(period):
         return None, None
     
     return start, end
+
+
+def split_date_range(start_date, end_date, shard='day'):
+    """Tarih aralığını günlük veya haftalık alt aralıklara böl"""
+    step = timedelta(days=7 if shard == 'week' else 1)
+    ranges = []
+    current = start_date
+    
+    while current <= end_date:
+        shard_end = min(current + step - timedelta(days=1), end_date)
+        ranges.append((current, shard_end))
+        current = shard_end + timedelta(days=1)
+    
+    return ranges
+
+
+def get_previous_period(start_date, end_date):
+    """Aynı uzunluktaki bir önceki dönemi hesapla"""
+    length = (end_date - start_date).days + 1
+    previous_end = start_date - timedelta(days=1)
+    return previous_end - timedelta(days=length - 1), previous_end
@@ -1,6 +1,9 @@
 """Formatting yardımcı fonksiyonları"""
+import numpy as np
 import pandas as pd
 
+POSITION_BUCKETS = ['🟢', '🟡', '🔴']
+
 
 def format_position(position):
     """Pozisyon değerine göre emoji ekle"""
@@ -21,3 +24,14 @@ def format_ctr(ctr):
     if ctr is None or pd.isna(ctr):
         return "0.00%"
     return f"{ctr * 100:.2f}%"
+
+
+def get_position_buckets(positions):
+    """Pozisyonları format_position ile aynı eşiklerle NumPy üzerinde emoji gruplarına ayır"""
+    pos = np.asarray(positions, dtype=np.float64)
+    codes = np.select(
+        [np.isnan(pos), (pos >= 1) & (pos <= 3), (pos >= 4) & (pos <= 10)],
+        [-1, 0, 1],
+        default=2
+    )
+    return pd.Categorical.from_codes(codes, categories=POSITION_BUCKETS)
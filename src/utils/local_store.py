@@ -0,0 +1,24 @@
+"""Yerel SQLite depolama yardımcıları"""
+import hashlib
+import os
+import sqlite3
+from src.config import LOCAL_STORE_DIR
+
+
+def get_store_path(namespace, key):
+    """Namespace ve anahtara göre SQLite dosya yolunu döndür"""
+    digest = hashlib.sha1(str(key).encode('utf-8')).hexdigest()[:16]
+    directory = os.path.join(LOCAL_STORE_DIR, namespace)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{digest}.sqlite")
+
+
+def connect_store(namespace, key, schema=None):
+    """SQLite deposuna bağlan, gerekirse şemayı oluştur"""
+    connection = sqlite3.connect(get_store_path(namespace, key), timeout=30)
+    # Eşzamanlı oturumlar okurken yazma yapılabilsin
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    if schema:
+        connection.executescript(schema)
+    return connection
@@ -0,0 +1,108 @@
+"""Search Console verileri için dönemler arası karşılaştırma"""
+import numpy as np
+import pandas as pd
+
+QUERY_COLUMN = 'Anahtar Kelime'
+PAGE_COLUMN = 'İlgili Sayfa'
+
+
+def _as_category(series):
+    """Sütun kategorik değilse kopyasını kategorik yap"""
+    return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+
+
+def _shared_codes(current, previous):
+    """İki kategorik sütunu ortak kategori listesine göre kodla
+    
+    Mevcut dönemin kategorileri aynen korunur, önceki dönemde yeni olanlar sona
+    eklenir; böylece metinler tek bir hash araması ile eşlenir.
+    """
+    current_categories = current.cat.categories.astype(object)
+    previous_categories = previous.cat.categories.astype(object)
+    
+    mapping = current_categories.get_indexer(previous_categories)
+    is_new = mapping < 0
+    mapping[is_new] = len(current_categories) + np.arange(int(is_new.sum()))
+    categories = current_categories.append(previous_categories[is_new])
+    
+    current_codes = current.cat.codes.to_numpy().astype(np.int64)
+    previous_codes = previous.cat.codes.to_numpy()
+    previous_codes = np.where(previous_codes >= 0, mapping[previous_codes], -1).astype(np.int64)
+    return categories, current_codes, previous_codes
+
+
+def _unique_with_inverse(values):
+    """Sıralı benzersiz değerler ve her değerin bu listedeki konumu (tek argsort ile)"""
+    order = np.argsort(values)
+    sorted_values = values[order]
+    is_first = np.empty(len(values), dtype=bool)
+    is_first[:1] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=is_first[1:])
+    inverse = np.empty(len(values), dtype=np.int64)
+    inverse[order] = np.cumsum(is_first) - 1
+    return sorted_values[is_first], inverse
+
+
+def _scatter(positions, values, size, fill=0.0):
+    """Dönem değerlerini ortak anahtar dizisindeki yerlerine yaz"""
+    result = np.full(size, fill, dtype=np.float64)
+    result[positions] = values
+    return result
+
+
+def compare_periods(current_df, previous_df):
+    """İki dönemi sorgu+sayfa bazında tamsayı kategori kodlarıyla birleştirip farkları hesapla"""
+    queries, current_queries, previous_queries = _shared_codes(
+        _as_category(current_df[QUERY_COLUMN]), _as_category(previous_df[QUERY_COLUMN])
+    )
+    pages, current_pages, previous_pages = _shared_codes(
+        _as_category(current_df[PAGE_COLUMN]), _as_category(previous_df[PAGE_COLUMN])
+    )
+    page_count = max(len(pages), 1)
+    
+    # Sorgu ve sayfa kodlarından tek bir int64 anahtar
+    current_keys = current_queries * page_count + current_pages
+    previous_keys = previous_queries * page_count + previous_pages
+    
+    keys, inverse = _unique_with_inverse(np.concatenate((current_keys, previous_keys)))
+    size = len(keys)
+    current_positions = inverse[:len(current_keys)]
+    previous_positions = inverse[len(current_keys):]
+    
+    clicks = _scatter(current_positions, current_df['Tıklama'].to_numpy(), size)
+    previous_clicks = _scatter(previous_positions, previous_df['Tıklama'].to_numpy(), size)
+    impressions = _scatter(current_positions, current_df['Gösterim'].to_numpy(), size)
+    previous_impressions = _scatter(previous_positions, previous_df['Gösterim'].to_numpy(), size)
+    position = _scatter(current_positions, current_df['Ortalama Pozisyon'].to_numpy(), size, np.nan)
+    previous_position = _scatter(previous_positions, previous_df['Ortalama Pozisyon'].to_numpy(), size, np.nan)
+    
+    return pd.DataFrame({
+        QUERY_COLUMN: pd.Categorical.from_codes(keys // page_count, categories=queries),
+        PAGE_COLUMN: pd.Categorical.from_codes(keys % page_count, categories=pages),
+        'Tıklama': clicks.astype(np.int64),
+        'Önceki Tıklama': previous_clicks.astype(np.int64),
+        'Tıklama Değişimi': (clicks - previous_clicks).astype(np.int64),
+        'Gösterim': impressions.astype(np.int64),
+        'Önceki Gösterim': previous_impressions.astype(np.int64),
+        'Gösterim Değişimi': (impressions - previous_impressions).astype(np.int64),
+        'Ortalama Pozisyon': position.astype(np.float32),
+        'Önceki Pozisyon': previous_position.astype(np.float32),
+        # Pozitif değer sıralamanın yükseldiğini (pozisyon numarasının azaldığını) gösterir
+        'Pozisyon Değişimi': (previous_position - position).astype(np.float32)
+    })
+
+
+def get_top_movers(comparison, column, n=20, largest=True):
+    """Bir değişim sütununda en büyük/küçük n satırı kısmi seçimle bul"""
+    values = comparison[column].to_numpy().astype(np.float64)
+    values = np.where(np.isnan(values), -np.inf if largest else np.inf, values)
+    if not largest:
+        values = -values
+    
+    n = min(n, len(values))
+    if n == 0:
+        return comparison.iloc[[]]
+    candidates = np.argpartition(values, len(values) - n)[len(values) - n:]
+    ordered = candidates[np.argsort(-values[candidates], kind='stable')]
+    result = comparison.iloc[ordered]
+    return result[np.isfinite(values[ordered]) & (values[ordered] > 0)]
@@ -0,0 +1,102 @@
+"""Kategorik sütunlar üzerinde trigram tabanlı alt metin arama indeksi"""
+from collections import OrderedDict
+import numpy as np
+
+# Eşleştirme için noktalı/noktasız i ayrımı yapılmaz: "IPHONE" hem "iphone" hem "ıphone" ile eşleşir
+_TURKISH_I_FOLD = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+
+
+def turkish_casefold(text):
+    """Metni eşleştirme için küçük harfe çevir - İ/I/ı/i aynı harfe katlanır"""
+    return text.translate(_TURKISH_I_FOLD).lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Benzersiz değerler üzerinde trigram -> değer kodu indeksi
+    
+    Kategorik bir sütunun kategorileri bir kez indekslenir; arama sonucu
+    eşleşen kategori kodlarıdır.
+    """
+    
+    def __init__(self, values):
+        self.values = [turkish_casefold(str(value)) for value in values]
+        postings = {}
+        for code, text in enumerate(self.values):
+            for trigram in _trigrams(text):
+                postings.setdefault(trigram, []).append(code)
+        self.postings = {
+            trigram: np.array(codes, dtype=np.int32)
+            for trigram, codes in postings.items()
+        }
+    
+    def match(self, term):
+        """Terimi içeren değerlerin kodlarını döndür"""
+        term = turkish_casefold(term)
+        
+        if len(term) < 3:
+            candidates = range(len(self.values))
+        else:
+            lists = []
+            for trigram in _trigrams(term):
+                codes = self.postings.get(trigram)
+                if codes is None:
+                    return np.empty(0, dtype=np.int32)
+                lists.append(codes)
+            
+            # En kısa listeden başlayarak kesişim al
+            lists.sort(key=len)
+            candidates = lists[0]
+            for codes in lists[1:]:
+                candidates = np.intersect1d(candidates, codes, assume_unique=True)
+                if len(candidates) == 0:
+                    break
+        
+        # Trigram eşleşmesi sıralamayı garanti etmez, adayları doğrula
+        return np.array(
+            [code for code in candidates if term in self.values[code]],
+            dtype=np.int32
+        )
+
+
+class FrameSearchIndex:
+    """DataFrame'in kategorik sütunlarında alt metin araması - sonuç satır konumlarıdır"""
+    
+    def __init__(self, df, columns, cache_size=32):
+        self.df = df
+        self.columns = columns
+        self.indexes = {}
+        self.codes = {}
+        for column in columns:
+            series = df[column]
+            if not hasattr(series, 'cat'):
+                series = series.astype('category')
+            self.indexes[column] = TrigramIndex(series.cat.categories)
+            self.codes[column] = series.cat.codes.to_numpy()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+    
+    def search(self, term):
+        """Herhangi bir sütunda terimi içeren satırların konumlarını döndür"""
+        if term in self._cache:
+            self._cache.move_to_end(term)
+            return self._cache[term]
+        
+        mask = np.zeros(len(self.df), dtype=bool)
+        for column in self.columns:
+            matched = self.indexes[column].match(term)
+            if len(matched) == 0:
+                continue
+            lookup = np.zeros(len(self.indexes[column].values), dtype=bool)
+            lookup[matched] = True
+            codes = self.codes[column]
+            mask |= (codes >= 0) & lookup[codes]
+        
+        row_ids = np.flatnonzero(mask)
+        self._cache[term] = row_ids
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return row_ids
@@ -0,0 +1,128 @@
+"""Sayfa URL'leri üzerinde dizin bazlı toplamlar için prefix ağacı"""
+from urllib.parse import urlsplit
+import numpy as np
+
+
+def split_url_path(url):
+    """URL'yi [alan adı, dizin1, dizin2, ...] parçalarına ayır"""
+    parts = urlsplit(url)
+    host = parts.netloc or ''
+    segments = [segment for segment in parts.path.split('/') if segment]
+    return [host] + segments
+
+
+class UrlTrieNode:
+    """Ağaç düğümü - alt ağaçtaki tüm sayfaların toplamlarını tutar"""
+    
+    __slots__ = ('children', 'clicks', 'impressions', 'weighted_position', 'position_impressions', 'page_count')
+    
+    def __init__(self):
+        self.children = {}
+        self.clicks = 0
+        self.impressions = 0
+        self.weighted_position = 0.0
+        self.position_impressions = 0
+        self.page_count = 0
+    
+    def summary(self):
+        """Düğüm toplamlarını gösterim ağırlıklı pozisyonla döndür"""
+        return {
+            'Tıklama': int(self.clicks),
+            'Gösterim': int(self.impressions),
+            'CTR': float(self.clicks / self.impressions * 100) if self.impressions > 0 else 0.0,
+            'Ortalama Pozisyon': (
+                self.weighted_position / self.position_impressions
+                if self.position_impressions > 0 else None
+            ),
+            'Sayfa Sayısı': self.page_count
+        }
+
+
+class UrlTrie:
+    """Sayfa URL'lerinin dizin ağacı - her önek için toplamlar O(derinlik) sürede okunur"""
+    
+    def __init__(self):
+        self.root = UrlTrieNode()
+    
+    def insert(self, url, clicks, impressions, weighted_position, position_impressions):
+        """Bir sayfanın metriklerini kök dahil yolu üzerindeki tüm düğümlere ekle"""
+        node = self.root
+        path = [node]
+        for segment in split_url_path(url):
+            child = node.children.get(segment)
+            if child is None:
+                child = UrlTrieNode()
+                node.children[segment] = child
+            node = child
+            path.append(node)
+        
+        for path_node in path:
+            path_node.clicks += clicks
+            path_node.impressions += impressions
+            path_node.weighted_position += weighted_position
+            path_node.position_impressions += position_impressions
+            path_node.page_count += 1
+    
+    def find(self, segments):
+        """Önek parçalarına karşılık gelen düğümü bul"""
+        node = self.root
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+    
+    def aggregate(self, segments):
+        """Önek için toplam metrikleri döndür"""
+        node = self.find(segments)
+        return node.summary() if node else None
+    
+    def children(self, segments):
+        """Önekin alt dizinlerini tıklamaya göre sıralı döndür"""
+        node = self.find(segments)
+        if node is None:
+            return []
+        rows = []
+        for segment, child in node.children.items():
+            row = {'Dizin': segment}
+            row.update(child.summary())
+            rows.append(row)
+        rows.sort(key=lambda row: row['Tıklama'], reverse=True)
+        return rows
+    
+    @classmethod
+    def from_frame(cls, df, page_column='İlgili Sayfa', clicks_column='Tıklama',
+                   impressions_column='Gösterim', position_column='Ortalama Pozisyon'):
+        """Kategorik sayfa sütunundan ağacı kur - satırlar önce sayfa kodu bazında NumPy ile toplanır"""
+        pages = df[page_column]
+        if not hasattr(pages, 'cat'):
+            pages = pages.astype('category')
+        codes = pages.cat.codes.to_numpy()
+        valid = codes >= 0
+        codes = codes[valid]
+        categories = pages.cat.categories
+        size = len(categories)
+        
+        impressions = df[impressions_column].to_numpy()[valid].astype(np.float64)
+        position = df[position_column].to_numpy()[valid].astype(np.float64)
+        has_position = ~np.isnan(position)
+        
+        clicks_by_page = np.bincount(codes, weights=df[clicks_column].to_numpy()[valid], minlength=size)
+        impressions_by_page = np.bincount(codes, weights=impressions, minlength=size)
+        weighted_by_page = np.bincount(
+            codes, weights=np.where(has_position, position * impressions, 0), minlength=size
+        )
+        position_impressions_by_page = np.bincount(
+            codes, weights=np.where(has_position, impressions, 0), minlength=size
+        )
+        
+        trie = cls()
+        for code in np.flatnonzero(np.bincount(codes, minlength=size)):
+            trie.insert(
+                str(categories[code]),
+                int(clicks_by_page[code]),
+                int(impressions_by_page[code]),
+                float(weighted_by_page[code]),
+                int(position_impressions_by_page[code])
+            )
+        return trie